@@ -0,0 +1,84 @@
+from concurrent.futures import ProcessPoolExecutor
+import Strategies as S
+import MarkovModelClasses as Cls
+import ResultCache
+
+
+def simulate_strategy(name, cohort_id, pop_size, if_vectorized=False, outcome_storage='list',
+                      cache_directory=None):
+    """ simulates a cohort under a registered strategy
+    (defined at the module level so that strategies can be simulated by a process pool)
+    :param name: name of the strategy (see Strategies.STRATEGIES)
+    :param cohort_id: cohort ID
+    :param pop_size: population size of the cohort
+    :param if_vectorized: set to True to simulate the cohort with the vectorized engine
+    :param outcome_storage: how patient outcomes are stored ('list', 'array' or 'stream', see CohortOutcomes)
+    :param cache_directory: directory of the ResultCache to reuse cohorts simulated earlier (no cache if None)
+    :returns: CohortOutcomes of the simulated cohort
+    """
+
+    cohort = Cls.Cohort(id=cohort_id,
+                        pop_size=pop_size,
+                        parameters=S.get_parameters(name=name),
+                        outcome_storage=outcome_storage)
+    cohort.simulate(sim_length=S.STRATEGIES[name].simLength,
+                    if_vectorized=if_vectorized,
+                    cache=None if cache_directory is None else ResultCache.ResultCache(directory=cache_directory))
+    return cohort.cohortOutcomes
+
+
+class BatchRunner:
+    def __init__(self, pop_size, cohort_id=0, if_vectorized=False, outcome_storage='list', cache_directory=None):
+        """ simulates a cohort under each of a set of strategies and keeps the outcomes of every
+        simulated strategy, so that a strategy shared by several comparisons is simulated only once
+        :param pop_size: population size of each cohort
+        :param cohort_id: cohort ID of every cohort (the same ID gives common random numbers across strategies)
+        :param if_vectorized: set to True to simulate cohorts with the vectorized engine
+            (whose cohorts are not paired patient by patient, see VectorizedModel.simulate_cohort)
+        :param outcome_storage: how patient outcomes are stored ('list', 'array' or 'stream', see CohortOutcomes)
+        :param cache_directory: directory of the ResultCache to reuse cohorts simulated by earlier runs
+            (no on-disk cache if None)
+        """
+
+        self.popSize = pop_size
+        self.cohortID = cohort_id
+        self.ifVectorized = if_vectorized
+        self.outcomeStorage = outcome_storage
+        self.cacheDirectory = cache_directory
+        self.cohortOutcomes = {}  # dictionary of cohort outcomes keyed by strategy name
+
+    def simulate(self, strategy_names, n_processes=1):
+        """ simulates the strategies that have not been simulated yet
+        :param strategy_names: names of strategies (see Strategies.STRATEGIES)
+        :param n_processes: number of processes to simulate the strategies in parallel
+        :returns: list of CohortOutcomes (in the order of strategy_names)
+        """
+
+        # strategies to simulate (each strategy once)
+        names = [name for name in dict.fromkeys(strategy_names) if name not in self.cohortOutcomes]
+        for name in names:
+            if name not in S.STRATEGIES:
+                raise ValueError('Unknown strategy: {}.'.format(name))
+
+        if n_processes > 1 and len(names) > 1:
+            # simulate one strategy per process
+            with ProcessPoolExecutor(max_workers=min(n_processes, len(names))) as executor:
+                outcomes = executor.map(simulate_strategy,
+                                        names,
+                                        [self.cohortID] * len(names),
+                                        [self.popSize] * len(names),
+                                        [self.ifVectorized] * len(names),
+                                        [self.outcomeStorage] * len(names),
+                                        [self.cacheDirectory] * len(names))
+                for name, cohort_outcomes in zip(names, outcomes):
+                    self.cohortOutcomes[name] = cohort_outcomes
+        else:
+            for name in names:
+                self.cohortOutcomes[name] = simulate_strategy(name=name,
+                                                              cohort_id=self.cohortID,
+                                                              pop_size=self.popSize,
+                                                              if_vectorized=self.ifVectorized,
+                                                              outcome_storage=self.outcomeStorage,
+                                                              cache_directory=self.cacheDirectory)
+
+        return [self.cohortOutcomes[name] for name in strategy_names]
@@ -0,0 +1,127 @@
+import time
+import numpy as np
+import Strategies as S
+import MarkovModelClasses as Cls
+import EventLog
+
+
+# microbenchmark of the cost of simulating one event with the per-patient engines:
+# Patient objects whose state is a HealthStates member (with Enum construction and tuple-membership checks
+# on every event, as before the states were tracked as integer codes), Patient objects on integer state codes,
+# and PatientSimulator (see simulate_patients)
+POP_SIZE = 5000
+N_REPEATS = 3
+STRATEGY_NAMES = ['No Screen At 45', 'FIT Screen At 45', 'DNA Screen At 45']
+
+
+class HealthStatesPatientStateMonitor(Cls.PatientStateMonitor):
+    """ a state monitor that tracks the current state as a HealthStates member """
+
+    def __init__(self, parameters):
+
+        Cls.PatientStateMonitor.__init__(self, parameters=parameters)
+        self.currentState = parameters.initialHealthState
+
+    def update(self, time, new_state):
+
+        health_states = self.healthStates
+
+        if new_state in (health_states.CRC_DEATH, health_states.NATURAL_DEATH):
+            self.survivalTime = time
+        if new_state in (health_states.SMALL, health_states.LARGE):
+            self.nPolyps += 1
+        if new_state == health_states.TREATMENT:
+            self.nTreatments += 1
+
+        self.costUtilityMonitor.update(time=time,
+                                       current_state_index=self.currentState.value,
+                                       next_state_index=new_state.value)
+        self.currentState = new_state
+        self.currentStateIndex = new_state.value
+
+
+class HealthStatesPatient(Cls.Patient):
+    """ a patient whose next state is constructed as a HealthStates member on every event """
+
+    def __init__(self, id, parameters):
+
+        Cls.Patient.__init__(self, id=id, parameters=parameters)
+        self.stateMonitor = HealthStatesPatientStateMonitor(parameters=parameters)
+
+    def simulate(self, sim_length):
+
+        rng = np.random.RandomState(seed=self.id)
+        gillespie = self.params.transTables
+        t = 0
+        while True:
+            dt, new_state_index = gillespie.get_next_state(
+                current_state_index=self.stateMonitor.currentState.value, rng=rng)
+            if dt is None:
+                break
+            if_stop = dt + t > sim_length
+            if if_stop:
+                t = sim_length
+                new_state_index = self.stateMonitor.currentState.value
+            else:
+                t += dt
+            self.stateMonitor.update(time=t, new_state=self.params.healthStates(new_state_index))
+            if if_stop:
+                break
+
+
+def simulate_patient_objects(patient_class):
+    """ :returns: a function that simulates the patients of a cohort as objects of patient_class """
+
+    def simulate(parameters, sim_length, pop_size):
+        outcomes = Cls.CohortOutcomes()
+        for i in range(pop_size):
+            patient = patient_class(id=i, parameters=parameters)
+            patient.simulate(sim_length)
+            outcomes.extract_outcome(simulated_patient=patient)
+    return simulate
+
+
+def simulate_with_simulator(parameters, sim_length, pop_size):
+    Cls.simulate_patients(cohort_id=0, pop_size=pop_size, parameters=parameters, sim_length=sim_length,
+                          first_index=0, last_index=pop_size)
+
+
+# engines to time: name -> function(parameters, sim_length, pop_size)
+ENGINES = {
+    'Patient (HealthStates)': simulate_patient_objects(patient_class=HealthStatesPatient),
+    'Patient (integer codes)': simulate_patient_objects(patient_class=Cls.Patient),
+    'PatientSimulator': simulate_with_simulator
+}
+
+
+def time_patients(simulate, parameters, sim_length, pop_size):
+    """ :returns: the shortest time (seconds) to simulate the patients of a cohort """
+
+    times = []
+    for _ in range(N_REPEATS):
+        start = time.perf_counter()
+        simulate(parameters=parameters, sim_length=sim_length, pop_size=pop_size)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+if __name__ == '__main__':
+    for name in STRATEGY_NAMES:
+        parameters = S.get_parameters(name=name)
+        sim_length = S.STRATEGIES[name].simLength
+
+        # number of events (from the event log of the same patients)
+        event_log = EventLog.EventLog()
+        Cls.simulate_patients(cohort_id=0, pop_size=POP_SIZE, parameters=parameters, sim_length=sim_length,
+                              first_index=0, last_index=POP_SIZE, event_log=event_log)
+
+        print('{}: {:,} events'.format(name, event_log.nEvents))
+        for engine, simulate in ENGINES.items():
+            elapsed = time_patients(simulate=simulate, parameters=parameters, sim_length=sim_length,
+                                    pop_size=POP_SIZE)
+            # time of setting up patients (with a simulation length of 0 each patient has a single event)
+            setup = time_patients(simulate=simulate, parameters=parameters, sim_length=0, pop_size=POP_SIZE)
+
+            print('  {:24s} {:.2f} microseconds per event (excluding setup), '
+                  '{:.1f} microseconds per patient (including setup)'.format(
+                    engine, 1e6 * (elapsed - setup) / (event_log.nEvents - POP_SIZE), 1e6 * elapsed / POP_SIZE))
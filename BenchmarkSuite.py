@@ -0,0 +1,171 @@
+import contextlib
+import csv
+import io
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# draw figures without opening windows
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+import numpy as np
+import Strategies as S
+import MarkovModelClasses as Cls
+import CompiledModel
+import EventLog
+import ResultCache
+import Support
+
+
+# scenarios (the comparisons of the Compare scripts): scenario name -> (strategy, reference strategy)
+SCENARIOS = {
+    '45Screen': ('Screen At 45', 'No Screen At 45'),
+    '50Screen': ('Screen At 50', 'No Screen At 50'),
+    'DNA': ('DNA Screen At 45', 'DNA Screen At 50'),
+    'DNA45': ('DNA Screen At 45', 'FIT Screen At 45'),
+    'FIT': ('FIT Screen At 45', 'FIT Screen At 50')
+}
+ENGINES = ['python', 'compiled', 'vectorized']
+POP_SIZES = [1000, 10000]
+HORIZONS = [10, None]   # simulation lengths (None for the simulation length of the scenario)
+
+# statistics of CohortOutcomes used by the reports
+STATISTICS = ['statSurvivalTime', 'statNPolyps', 'statNTreatments', 'statCost', 'statUtility', 'nLivingPatients']
+
+FILE_NAME = 'BenchmarkResults'  # results are written to FILE_NAME.json and FILE_NAME.csv
+
+
+def count_events(parameters, pop_size, sim_length, engine):
+    """ :returns: the number of events of the patients simulated by an engine
+    (the per-patient engines simulate the same patients, so their events are counted with PatientSimulator)
+    """
+
+    event_log = EventLog.EventLog(max_events_in_memory=2 ** 40)
+    Cls.Cohort(id=0, pop_size=pop_size, parameters=parameters).simulate(
+        sim_length=sim_length, if_vectorized=(engine == 'vectorized'), event_log=event_log)
+    return event_log.nEvents
+
+
+def calculate_statistics(cohort_outcomes, pop_size):
+    """ calculates the summary statistics and the survival curve of the outcomes of a cohort
+    (see CohortOutcomes.calculate_cohort_outcomes)
+    """
+
+    cohort_outcomes.calculate_cohort_outcomes(initial_pop_size=pop_size)
+    # the statistics and the survival curve are calculated on their first access
+    for name in STATISTICS:
+        getattr(cohort_outcomes, name)
+
+
+def run_case(scenario, engine, pop_size, horizon):
+    """ simulates and reports one scenario (run in a new process so that its peak memory is measured alone)
+    :returns: dictionary of the results of the case
+    """
+
+    names = SCENARIOS[scenario]
+    sim_length = S.STRATEGIES[names[0]].simLength if horizon is None else horizon
+
+    simulation_time = statistics_time = 0
+    n_events = 0
+    outcomes = []
+    for name in names:
+        parameters = S.get_parameters(name=name)
+        # warm up (so that compiling the kernel is not timed)
+        Cls.Cohort(id=0, pop_size=1, parameters=parameters).simulate(sim_length=sim_length,
+                                                                     if_vectorized=(engine == 'vectorized'),
+                                                                     if_compiled=(engine == 'compiled'))
+
+        cohort = Cls.Cohort(id=0, pop_size=pop_size, parameters=parameters)
+
+        # simulation (the statistics are only calculated when they are first accessed below)
+        start = time.perf_counter()
+        cohort.simulate(sim_length=sim_length,
+                        if_vectorized=(engine == 'vectorized'),
+                        if_compiled=(engine == 'compiled'))
+        elapsed = time.perf_counter() - start
+
+        # statistics (the reports below reuse the statistics and the survival curve calculated here)
+        start = time.perf_counter()
+        calculate_statistics(cohort_outcomes=cohort.cohortOutcomes, pop_size=pop_size)
+        statistics_elapsed = time.perf_counter() - start
+        statistics_time += statistics_elapsed
+        simulation_time += elapsed
+
+        n_events += count_events(parameters=parameters, pop_size=pop_size, sim_length=sim_length, engine=engine)
+        outcomes.append(cohort.cohortOutcomes)
+
+    # reporting (comparative outcomes, CEA and CBA; cohorts of the vectorized engine are not paired)
+    if_paired = engine != 'vectorized'
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        Support.print_comparative_outcomes(sim_outcomes=outcomes[0], ref_outcomes=outcomes[1], if_paired=if_paired)
+        Support.report_CEA_CBA(sim_outcomes=outcomes[0], ref_outcomes=outcomes[1],
+                               strategy_name=names[0], ref_name=names[1], if_paired=if_paired)
+    reporting_time = time.perf_counter() - start
+
+    n_patients = len(names) * pop_size
+    return {
+        'scenario': scenario,
+        'engine': engine,
+        'pop_size': pop_size,
+        'horizon': sim_length,
+        'n_patients': n_patients,
+        'n_events': n_events,
+        'simulation_seconds': simulation_time,
+        'statistics_seconds': statistics_time,
+        'reporting_seconds': reporting_time,
+        'patients_per_second': n_patients / simulation_time,
+        'events_per_second': n_events / simulation_time,
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    }
+
+
+def run_benchmarks(scenarios=SCENARIOS, engines=ENGINES, pop_sizes=POP_SIZES, horizons=HORIZONS,
+                   file_name=FILE_NAME):
+    """ runs every combination of scenario, engine, cohort size and horizon, prints the results and
+    writes them to file_name.json (with the versions of the software) and file_name.csv
+    :returns: list of the results of each case
+    """
+
+    if 'compiled' in engines and not CompiledModel.IF_COMPILED:
+        print('numba is not installed: the compiled engine is skipped.')
+        engines = [engine for engine in engines if engine != 'compiled']
+
+    results = []
+    for scenario in scenarios:
+        for engine in engines:
+            for pop_size in pop_sizes:
+                for horizon in horizons:
+                    # a new process for each case (spawned, so it does not inherit the memory of this process)
+                    with ProcessPoolExecutor(max_workers=1,
+                                             mp_context=multiprocessing.get_context('spawn')) as executor:
+                        result = executor.submit(run_case, scenario, engine, pop_size, horizon).result()
+                    results.append(result)
+                    print('{scenario:9s} {engine:10s} {pop_size:7,d} patients {horizon:3g} years: '
+                          '{patients_per_second:11,.0f} patients/s {events_per_second:12,.0f} events/s '
+                          '(simulation {simulation_seconds:.3f} s, statistics {statistics_seconds:.3f} s, '
+                          'reporting {reporting_seconds:.3f} s) peak RSS {peak_rss_mb:.0f} MB'.format(**result))
+
+    # machine-readable results
+    with open(file_name + '.json', 'w') as file:
+        json.dump({'python': platform.python_version(),
+                   'numpy': np.__version__,
+                   'engine_version': ResultCache.ENGINE_VERSION,
+                   'if_compiled': CompiledModel.IF_COMPILED,
+                   'machine': platform.machine(),
+                   'time': time.strftime('%Y-%m-%d %H:%M:%S'),
+                   'results': results}, file, indent=2)
+    with open(file_name + '.csv', 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=list(results[0]))
+        writer.writeheader()
+        writer.writerows(results)
+
+    return results
+
+
+if __name__ == '__main__':
+    run_benchmarks()
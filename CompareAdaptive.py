@@ -0,0 +1,50 @@
+import InputDataFIT as D
+import Strategies as S
+import SequentialComparison
+
+
+BATCH_SIZE = 2000           # number of patients simulated under each strategy in each batch
+MAX_POP_SIZE = 200000       # maximum number of patients simulated under each strategy
+TARGET_HALF_WIDTH = 100     # target half-width of the confidence interval of the incremental NMB ($)
+IF_STOP_ON_DECISION = True  # stop as soon as the confidence interval of the incremental NMB excludes 0
+
+# comparisons: (strategy, reference strategy, willingness-to-pay per utility ($))
+# (the willingness-to-pay at which the Compare script of the comparison recommends the strategy;
+# DNA Screen At 45 vs. DNA Screen At 50 is left out since CompareDNA finds screening at 45 dominant,
+# so there is no willingness-to-pay at which the decision changes)
+COMPARISONS = [
+    ('Screen At 45', 'No Screen At 45', 10719),         # CompareAlternatives45
+    ('FIT Screen At 45', 'FIT Screen At 50', 2355),     # CompareFIT
+    ('DNA Screen At 45', 'FIT Screen At 45', 20198)     # CompareDNA45
+]
+
+
+if __name__ == '__main__':
+    for name, ref_name, wtp in COMPARISONS:
+
+        # simulate batches of patients until the incremental NMB is estimated precisely enough
+        comparison = SequentialComparison.SequentialComparison(
+            parameters=S.get_parameters(name=name),
+            ref_parameters=S.get_parameters(name=ref_name),
+            sim_length=S.STRATEGIES[name].simLength,
+            wtp=wtp,
+            batch_size=BATCH_SIZE,
+            if_paired=D.IF_PAIRED)
+        if_reached = comparison.simulate(target_half_width=TARGET_HALF_WIDTH,
+                                         max_pop_size=MAX_POP_SIZE,
+                                         alpha=D.ALPHA,
+                                         if_stop_on_decision=IF_STOP_ON_DECISION)
+
+        # print the estimates
+        print('{} vs. {} (willingness-to-pay ${:,})'.format(name, ref_name, wtp))
+        print('  Number of patients simulated under each strategy:', comparison.nPatients,
+              '' if if_reached else '(stopped at the maximum number of patients)')
+        for outcome, text, deci in (('cost', 'Increase in mean discounted cost', 0),
+                                    ('utility', 'Increase in mean discounted utility', 3),
+                                    ('nmb', 'Incremental net monetary benefit', 0)):
+            print('  {} and {:.{prec}%} confidence interval:'.format(text, 1 - D.ALPHA, prec=0),
+                  comparison.get_formatted_incremental_mean_and_interval(outcome=outcome,
+                                                                         alpha=D.ALPHA,
+                                                                         deci=deci,
+                                                                         form=','))
+        print('')
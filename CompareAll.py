@@ -0,0 +1,28 @@
+import InputDataFIT as D
+import BatchRunner
+import Support as Support
+
+
+N_PROCESSES = 4     # number of processes to simulate the strategies in parallel
+
+# strategies of the 45 years old cohort simulated over 30 years
+# (the first strategy is the 'Base' strategy of the CEA)
+STRATEGY_NAMES = ['No Screen At 45', 'FIT Screen At 45', 'FIT Screen At 50', 'DNA Screen At 45', 'DNA Screen At 50']
+
+
+if __name__ == '__main__':
+    # simulate each strategy once
+    # (cohorts of all strategies share the same id so that they use common random numbers)
+    runner = BatchRunner.BatchRunner(pop_size=D.POP_SIZE, cohort_id=0,
+                                     cache_directory='SimulationCache' if D.IF_USE_CACHE else None)
+    all_outcomes = runner.simulate(strategy_names=STRATEGY_NAMES, n_processes=N_PROCESSES)
+
+    # print the estimates for different strategies
+    for name, outcomes in zip(STRATEGY_NAMES, all_outcomes):
+        Support.print_outcomes(sim_outcomes=outcomes, therapy_name=name)
+
+    # report the CEA results of all strategies
+    Support.report_CEA_frontier(strategy_outcomes=dict(zip(STRATEGY_NAMES, all_outcomes)),
+                                y_range=(-3000, 3000),
+                                file_name='CETableAll.csv',
+                                if_paired=D.IF_PAIRED)
@@ -1,44 +1,59 @@
 import InputData45Screen as D
-import ParameterClasses as P
+import Strategies as S
 import MarkovModelClasses as Cls
 import Support as Support
+import ResultCache
 
 
-# simulating mono therapy
+# strategy to evaluate and the reference strategy
+STRATEGY = S.STRATEGIES['Screen At 45']
+REF_STRATEGY = S.STRATEGIES['No Screen At 45']
+
+# outcomes of cohorts simulated by earlier runs (delete the cache directory to simulate them again;
+# the cache is keyed by ResultCache.ENGINE_VERSION, so bump it after changing the model)
+CACHE = ResultCache.ResultCache() if D.IF_USE_CACHE else None
+
+# simulating screening at 45
 # create a cohort
 # id could be any number, could be changed to 0
-cohort_screen = Cls.Cohort(id=1,
+cohort_screen = Cls.Cohort(id=0 if D.IF_PAIRED else 1,
                            pop_size=D.POP_SIZE,
-                           parameters=P.Parameters(therapy=P.Therapies.Screen))
+                           parameters=S.get_parameters(name=STRATEGY.name))
 # simulate the cohort
-cohort_screen.simulate(sim_length=D.SIM_TIME_STEPS)
+cohort_screen.simulate(sim_length=STRATEGY.simLength, cache=CACHE)
 
-# simulating combination therapy
+# simulating no screening
 # create a cohort
 cohort_no_screen = Cls.Cohort(id=0,
                               pop_size=D.POP_SIZE,
-                              parameters=P.Parameters(therapy=P.Therapies.NoScreen))
+                              parameters=S.get_parameters(name=REF_STRATEGY.name))
 # simulate the cohort
-cohort_no_screen.simulate(sim_length=D.SIM_TIME_STEPS)
+cohort_no_screen.simulate(sim_length=REF_STRATEGY.simLength, cache=CACHE)
 
-# print the estimates for different therapies
+# print the estimates for different strategies
 Support.print_outcomes(sim_outcomes=cohort_screen.cohortOutcomes,
-                       therapy_name=P.Therapies.Screen)
+                       therapy_name=STRATEGY.name)
 Support.print_outcomes(sim_outcomes=cohort_no_screen.cohortOutcomes,
-                       therapy_name=P.Therapies.NoScreen)
+                       therapy_name=REF_STRATEGY.name)
 
 # draw survival curves and histograms
-Support.plot_survival_curves_and_histograms(sim_outcomes_screen=cohort_screen.cohortOutcomes,
-                                            sim_outcomes_no_screen=cohort_no_screen.cohortOutcomes)
+Support.plot_survival_curves_and_histograms(sim_outcomes=cohort_screen.cohortOutcomes,
+                                            ref_outcomes=cohort_no_screen.cohortOutcomes,
+                                            strategy_name=STRATEGY.name,
+                                            ref_name=REF_STRATEGY.name)
 
 
 # print comparative outcomes
-Support.print_comparative_outcomes(sim_outcomes_screen=cohort_screen.cohortOutcomes,
-                                   sim_outcomes_no_screen=cohort_no_screen.cohortOutcomes)
+Support.print_comparative_outcomes(sim_outcomes=cohort_screen.cohortOutcomes,
+                                   ref_outcomes=cohort_no_screen.cohortOutcomes,
+                                   if_paired=D.IF_PAIRED)
 
 # report the CEA results
-Support.report_CEA_CBA(sim_outcomes_screen=cohort_screen.cohortOutcomes,
-                       sim_outcomes_no_screen=cohort_no_screen.cohortOutcomes)
+Support.report_CEA_CBA(sim_outcomes=cohort_screen.cohortOutcomes,
+                       ref_outcomes=cohort_no_screen.cohortOutcomes,
+                       strategy_name=STRATEGY.name,
+                       ref_name=REF_STRATEGY.name,
+                       if_paired=D.IF_PAIRED)
 
 
 print('If the willingness-to-pay is $10,719, I would recommend adopting this screening strategy')
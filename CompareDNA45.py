@@ -1,44 +1,61 @@
-import InputDataDNA45 as D
-import ParameterDNA45 as P
-import MarkovModelDNA45 as Cls
-import SupportDNA45 as Support
+import InputDataDNA as D
+import Strategies as S
+import MarkovModelClasses as Cls
+import Support as Support
+import ResultCache
 
 
-# simulating mono therapy
+# strategy to evaluate and the reference strategy
+STRATEGY = S.STRATEGIES['DNA Screen At 45']
+REF_STRATEGY = S.STRATEGIES['FIT Screen At 45']
+
+# outcomes of cohorts simulated by earlier runs (delete the cache directory to simulate them again;
+# the cache is keyed by ResultCache.ENGINE_VERSION, so bump it after changing the model)
+CACHE = ResultCache.ResultCache() if D.IF_USE_CACHE else None
+
+# simulating MT-sDNA screening at 45
 # create a cohort
 # id could be any number, could be changed to 0
-cohort_DNAscreen = Cls.Cohort(id=1,
+cohort_DNAscreen = Cls.Cohort(id=0 if D.IF_PAIRED else 1,
                               pop_size=D.POP_SIZE,
-                              parameters=P.Parameters(therapy=P.Therapies.ScreenDNA45))
+                              parameters=S.get_parameters(name=STRATEGY.name))
 # simulate the cohort
-cohort_DNAscreen.simulate(sim_length=D.SIM_TIME_STEPS)
+cohort_DNAscreen.simulate(sim_length=STRATEGY.simLength, cache=CACHE)
 
-# simulating combination therapy
+# simulating FIT screening at 45
 # create a cohort
 cohort_FITscreen = Cls.Cohort(id=0,
                               pop_size=D.POP_SIZE,
-                              parameters=P.Parameters(therapy=P.Therapies.ScreenFIT45))
+                              parameters=S.get_parameters(name=REF_STRATEGY.name))
 # simulate the cohort
-cohort_FITscreen.simulate(sim_length=D.SIM_TIME_STEPS)
+cohort_FITscreen.simulate(sim_length=REF_STRATEGY.simLength, cache=CACHE)
 
-# print the estimates for different therapies
+# print the estimates for different strategies
 Support.print_outcomes(sim_outcomes=cohort_DNAscreen.cohortOutcomes,
-                       therapy_name=P.Therapies.ScreenDNA45)
+                       therapy_name=STRATEGY.name)
 Support.print_outcomes(sim_outcomes=cohort_FITscreen.cohortOutcomes,
-                       therapy_name=P.Therapies.ScreenFIT45)
+                       therapy_name=REF_STRATEGY.name)
 
 # draw survival curves and histograms
-Support.plot_survival_curves_and_histograms(sim_outcomes_DNAscreen=cohort_DNAscreen.cohortOutcomes,
-                                            sim_outcomes_FITscreen=cohort_FITscreen.cohortOutcomes)
+Support.plot_survival_curves_and_histograms(sim_outcomes=cohort_DNAscreen.cohortOutcomes,
+                                            ref_outcomes=cohort_FITscreen.cohortOutcomes,
+                                            strategy_name=STRATEGY.name,
+                                            ref_name=REF_STRATEGY.name)
 
 
 # print comparative outcomes
-Support.print_comparative_outcomes(sim_outcomes_DNAscreen=cohort_DNAscreen.cohortOutcomes,
-                                   sim_outcomes_FITscreen=cohort_FITscreen.cohortOutcomes)
+Support.print_comparative_outcomes(sim_outcomes=cohort_DNAscreen.cohortOutcomes,
+                                   ref_outcomes=cohort_FITscreen.cohortOutcomes,
+                                   if_paired=D.IF_PAIRED)
 
 # report the CEA results
-Support.report_CEA_CBA(sim_outcomes_DNAscreen=cohort_DNAscreen.cohortOutcomes,
-                       sim_outcomes_FITscreen=cohort_FITscreen.cohortOutcomes)
+Support.report_CEA_CBA(sim_outcomes=cohort_DNAscreen.cohortOutcomes,
+                       ref_outcomes=cohort_FITscreen.cohortOutcomes,
+                       strategy_name=STRATEGY.name,
+                       ref_name=REF_STRATEGY.name,
+                       y_range=(-3000, 1000),
+                       wtp_range=(0, 23000),
+                       if_paired=D.IF_PAIRED)
 
 
 print('If the willingness-to-pay is $20,198, I would recommend adopting DNA screening strategy among '
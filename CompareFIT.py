@@ -1,45 +1,59 @@
 import InputDataFIT as D
-import ParameterFIT as P
-import MarkovModelFIT as Cls
-import SupportFIT as Support
+import Strategies as S
+import MarkovModelClasses as Cls
+import Support as Support
+import ResultCache
 
 
-# simulating screening at 45 strategy
+# strategy to evaluate and the reference strategy
+STRATEGY = S.STRATEGIES['FIT Screen At 45']
+REF_STRATEGY = S.STRATEGIES['FIT Screen At 50']
+
+# outcomes of cohorts simulated by earlier runs (delete the cache directory to simulate them again;
+# the cache is keyed by ResultCache.ENGINE_VERSION, so bump it after changing the model)
+CACHE = ResultCache.ResultCache() if D.IF_USE_CACHE else None
+
+# simulating screening at 45
 # create a cohort
 # id could be any number, could be changed to 0
-
-cohort_45screen = Cls.Cohort(id=1,
+cohort_45screen = Cls.Cohort(id=0 if D.IF_PAIRED else 1,
                              pop_size=D.POP_SIZE,
-                             parameters=P.Parameters(therapy=P.Therapies.Screen45))
+                             parameters=S.get_parameters(name=STRATEGY.name))
 # simulate the cohort
-cohort_45screen.simulate(sim_length=D.SIM_TIME_STEPS)
+cohort_45screen.simulate(sim_length=STRATEGY.simLength, cache=CACHE)
 
-# simulating screening at 50 strategy
+# simulating screening at 50
 # create a cohort
 cohort_50screen = Cls.Cohort(id=0,
                              pop_size=D.POP_SIZE,
-                             parameters=P.Parameters(therapy=P.Therapies.Screen50))
+                             parameters=S.get_parameters(name=REF_STRATEGY.name))
 # simulate the cohort
-cohort_50screen.simulate(sim_length=D.SIM_TIME_STEPS)
+cohort_50screen.simulate(sim_length=REF_STRATEGY.simLength, cache=CACHE)
 
-# print the estimates for different therapies
+# print the estimates for different strategies
 Support.print_outcomes(sim_outcomes=cohort_45screen.cohortOutcomes,
-                       therapy_name=P.Therapies.Screen45)
+                       therapy_name=STRATEGY.name)
 Support.print_outcomes(sim_outcomes=cohort_50screen.cohortOutcomes,
-                       therapy_name=P.Therapies.Screen50)
+                       therapy_name=REF_STRATEGY.name)
 
 # draw survival curves and histograms
-Support.plot_survival_curves_and_histograms(sim_outcomes_45screen=cohort_45screen.cohortOutcomes,
-                                            sim_outcomes_50screen=cohort_50screen.cohortOutcomes)
+Support.plot_survival_curves_and_histograms(sim_outcomes=cohort_45screen.cohortOutcomes,
+                                            ref_outcomes=cohort_50screen.cohortOutcomes,
+                                            strategy_name=STRATEGY.name,
+                                            ref_name=REF_STRATEGY.name)
 
 
 # print comparative outcomes
-Support.print_comparative_outcomes(sim_outcomes_45screen=cohort_45screen.cohortOutcomes,
-                                   sim_outcomes_50screen=cohort_50screen.cohortOutcomes)
+Support.print_comparative_outcomes(sim_outcomes=cohort_45screen.cohortOutcomes,
+                                   ref_outcomes=cohort_50screen.cohortOutcomes,
+                                   if_paired=D.IF_PAIRED)
 
 # report the CEA results
-Support.report_CEA_CBA(sim_outcomes_45screen=cohort_45screen.cohortOutcomes,
-                       sim_outcomes_50screen=cohort_50screen.cohortOutcomes)
+Support.report_CEA_CBA(sim_outcomes=cohort_45screen.cohortOutcomes,
+                       ref_outcomes=cohort_50screen.cohortOutcomes,
+                       strategy_name=STRATEGY.name,
+                       ref_name=REF_STRATEGY.name,
+                       if_paired=D.IF_PAIRED)
 
 
 print('If the willingness-to-pay is $2,355, I would recommend adopting strategy screening at 45')
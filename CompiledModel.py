@@ -0,0 +1,91 @@
+import math
+import numpy as np
+import VectorizedModel
+
+# the kernel is compiled with numba if it is installed
+# (otherwise patients are simulated with PatientSimulator, see MarkovModelClasses.simulate_patients)
+try:
+    from numba import njit
+    IF_COMPILED = True
+except ImportError:
+    IF_COMPILED = False
+
+    def njit(*args, **kwargs):
+        return lambda function: function
+
+
+@njit(cache=True)
+def _simulate_patients(first_patient_id, n_patients, sim_length, initial_state, if_absorbing, mean_sojourn_times,
+                       cum_jump_probs):
+    """ simulates patients one at a time on integer state codes (the same random numbers as
+    Patient.simulate) and records their events
+    :returns: (index of the patient, time, state before and state after) of each event as NumPy arrays
+    """
+
+    n_states = len(if_absorbing)
+    # arrays of the events (doubled in size when full)
+    patient_indices = np.empty(8 * n_patients + 8, dtype=np.int64)
+    times = np.empty(8 * n_patients + 8)
+    from_states = np.empty(8 * n_patients + 8, dtype=np.int64)
+    to_states = np.empty(8 * n_patients + 8, dtype=np.int64)
+    n_events = 0
+
+    for k in range(n_patients):
+        # random number generator of this patient (the Mersenne Twister seeded with the patient id,
+        # as np.random.RandomState(seed=id) in Patient.simulate)
+        np.random.seed(first_patient_id + k)
+
+        state = initial_state
+        t = 0.0
+
+        while not if_absorbing[state]:
+            # time until the next event (rng.exponential) and the next state (searchsorted)
+            dt = mean_sojourn_times[state] * -math.log(1.0 - np.random.random())
+            u = np.random.random()
+            new_state = 0
+            while new_state < n_states and cum_jump_probs[state, new_state] <= u:
+                new_state += 1
+
+            # if the next event occurs beyond the simulation length,
+            # the patient stays in the current state until the end of the simulation
+            if_end = dt + t > sim_length
+            if if_end:
+                t = sim_length
+                new_state = state
+            else:
+                t += dt
+
+            if n_events == len(times):
+                patient_indices = np.concatenate((patient_indices, np.empty_like(patient_indices)))
+                times = np.concatenate((times, np.empty_like(times)))
+                from_states = np.concatenate((from_states, np.empty_like(from_states)))
+                to_states = np.concatenate((to_states, np.empty_like(to_states)))
+            patient_indices[n_events] = k
+            times[n_events] = t
+            from_states[n_events] = state
+            to_states[n_events] = new_state
+            n_events += 1
+
+            state = new_state
+            if if_end:
+                break
+
+    return patient_indices[:n_events], times[:n_events], from_states[:n_events], to_states[:n_events]
+
+
+def simulate_patients(parameters, sim_length, first_patient_id, n_patients):
+    """ simulates patients with the compiled kernel (see MarkovModelClasses.PatientSimulator)
+    :param parameters: parameters of the model
+    :param sim_length: simulation length
+    :param first_patient_id: id of the first patient (patient ids are first_patient_id, first_patient_id + 1, ...)
+    :param n_patients: number of patients to simulate
+    :returns: (index of the patient (0, 1, ...), time, state before and state after) of each event
+        as NumPy arrays (the events of each patient in the order of time, patient after patient)
+    """
+
+    tables = VectorizedModel.VectorizedCohortTables(parameters=parameters)
+    with np.errstate(divide='ignore'):
+        mean_sojourn_times = 1 / tables.exitRates
+
+    return _simulate_patients(first_patient_id, n_patients, float(sim_length), tables.initialStateIndex,
+                              tables.ifAbsorbing, mean_sojourn_times, tables.cumJumpProbs)
@@ -0,0 +1,81 @@
+import copy
+import csv
+import numpy as np
+import InputDataDNA as D
+import Strategies as S
+import MarkovModelClasses as Cls
+import EventLog
+import Trajectories
+
+
+# strategy to evaluate and the reference strategy
+STRATEGY_NAMES = ['DNA Screen At 45', 'DNA Screen At 50']
+# annual costs of MT-sDNA screening to evaluate
+DNA_COSTS = np.linspace(D.DNA_COST * 0.5, D.DNA_COST * 1.5, 1000)
+
+
+def get_icer(incremental_cost, incremental_utility):
+    """ :returns: the ICER of the strategy with respect to the reference strategy, or 'Dominant' if the strategy
+        costs no more and is at least as effective and 'Dominated' if it costs at least as much and is at most
+        as effective (as Econ.CEA reports strategies that are not on the cost-effectiveness frontier)
+    :param incremental_cost: mean cost of the strategy minus mean cost of the reference strategy
+    :param incremental_utility: mean utility of the strategy minus mean utility of the reference strategy
+    """
+
+    if incremental_utility >= 0 and incremental_cost <= 0:
+        return 'Dominant'
+    if incremental_utility <= 0 and incremental_cost >= 0:
+        return 'Dominated'
+    return incremental_cost / incremental_utility
+
+
+def sweep_screening_cost(strategy_names, screening_costs, pop_size, file_name='CostSweepDNA.csv'):
+    """ simulates the cohort of each strategy once (recording its trajectories) and re-calculates the
+    discounted costs of the patients for each annual cost of screening (which does not change the trajectories)
+    :param strategy_names: names of the strategy and the reference strategy
+    :param screening_costs: annual costs of screening to evaluate
+    :param pop_size: population size of the cohorts
+    :param file_name: csv file to write the mean costs, incremental cost and utility, and ICER to
+    """
+
+    trajectories = []
+    base_parameters = []
+    mean_utilities = []
+    for name in strategy_names:
+        parameters = S.get_parameters(name=name)
+        # simulate the cohort and record its events
+        # (with a per-patient engine, so that the cohorts of the strategies have common random numbers)
+        event_log = EventLog.EventLog(max_events_in_memory=2 ** 40)
+        cohort = Cls.Cohort(id=0, pop_size=pop_size, parameters=parameters, outcome_storage='array')
+        cohort.simulate(sim_length=S.STRATEGIES[name].simLength, if_compiled=True, event_log=event_log)
+
+        trajectories.append(Trajectories.CohortTrajectories(events=event_log.get_events(),
+                                                            cohort_id=0,
+                                                            pop_size=pop_size,
+                                                            n_states=len(parameters.healthStates)))
+        base_parameters.append(parameters)
+        # utilities do not depend on the cost of screening
+        mean_utilities.append(np.mean(cohort.cohortOutcomes.utilities))
+
+    with open(file_name, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['Screening cost'] + ['Mean cost ' + name for name in strategy_names]
+                        + ['Incremental cost', 'Incremental utility', 'ICER'])
+        for screening_cost in screening_costs:
+            mean_costs = []
+            for trajectory, base in zip(trajectories, base_parameters):
+                parameters = copy.copy(base)
+                parameters.annualTreatmentCost = screening_cost
+                parameters.build_tables()
+                costs, _ = trajectory.rescore(cost_utility_tables=parameters.costUtilityTables)
+                mean_costs.append(np.mean(costs))
+
+            incremental_cost = mean_costs[0] - mean_costs[1]
+            incremental_utility = mean_utilities[0] - mean_utilities[1]
+            writer.writerow([screening_cost] + mean_costs + [incremental_cost, incremental_utility,
+                                                             get_icer(incremental_cost=incremental_cost,
+                                                                      incremental_utility=incremental_utility)])
+
+
+if __name__ == '__main__':
+    sweep_screening_cost(strategy_names=STRATEGY_NAMES, screening_costs=DNA_COSTS, pop_size=D.POP_SIZE)
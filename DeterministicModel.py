@@ -0,0 +1,127 @@
+import numpy as np
+import VectorizedModel
+
+
+def expm(a):
+    """ matrix exponential (scaling and squaring with a Taylor series)
+    :param a: square matrix
+    :returns: the matrix exponential of a
+    """
+
+    # scale the matrix so that its norm is below 0.5
+    norm = np.linalg.norm(a, ord=np.inf)
+    n_squarings = max(0, int(np.ceil(np.log2(norm / 0.5)))) if norm > 0 else 0
+    a = a / 2 ** n_squarings
+
+    # Taylor series of the scaled matrix
+    result = np.eye(len(a))
+    term = np.eye(len(a))
+    for k in range(1, 20):
+        term = term @ a / k
+        result = result + term
+
+    # undo the scaling
+    for _ in range(n_squarings):
+        result = result @ result
+    return result
+
+
+class DeterministicCohort:
+
+    def __init__(self, parameters):
+        """ a cohort whose expected outcomes are calculated by solving the Kolmogorov forward
+        equations of the model (instead of simulating patients)
+        :param parameters: parameters of the model
+        """
+
+        self.params = parameters
+
+        self.times = None  # time points of the state occupancy and the survival curve
+        self.stateOccupancy = None  # probability of being in each state at each time point
+        self.survivalCurve = None  # probability of being alive at each time point
+
+        self.expectedCost = None  # expected discounted cost
+        self.expectedUtility = None  # expected discounted utility
+        self.expectedNPolyps = None  # expected number of polyps
+        self.expectedNTreatments = None  # expected number of treatments
+        self.probDeath = None  # probability of dying during the simulation
+        self.meanSurvivalTime = None  # mean survival time of patients who die during the simulation
+
+    def solve(self, sim_length, n_steps_per_year=12):
+        """ calculates the expected outcomes over the specified simulation length
+        :param sim_length: simulation length
+        :param n_steps_per_year: number of time points per year at which the state occupancy is reported
+            (the expected costs, utilities and counts are exact regardless of the time step)
+        """
+
+        tables = VectorizedModel.VectorizedCohortTables(parameters=self.params)
+        n_states = len(tables.exitRates)
+        r = tables.discountRate
+
+        # rates of jumping from each state to each state (including re-entering the same state)
+        jump_probs = np.diff(tables.cumJumpProbs, axis=1, prepend=0)
+        jump_probs[tables.ifAbsorbing] = 0
+        jump_rates = tables.exitRates[:, np.newaxis] * jump_probs
+        # generator of the Markov process
+        generator = jump_rates - np.diag(jump_rates.sum(axis=1))
+
+        # time points
+        n_steps = int(np.ceil(sim_length * n_steps_per_year))
+        self.times = np.linspace(0, sim_length, n_steps + 1)
+        h = sim_length / n_steps
+
+        # transition probabilities over one time step and the integrals of the (discounted)
+        # transition probabilities over one time step (block matrix exponential)
+        def integral(rate):
+            block = np.zeros((2 * n_states, 2 * n_states))
+            block[:n_states, :n_states] = generator - rate * np.eye(n_states)
+            block[:n_states, n_states:] = np.eye(n_states)
+            exp_block = expm(block * h)
+            return exp_block[:n_states, :n_states], exp_block[:n_states, n_states:]
+
+        trans_probs, occupancy_integral = integral(0)
+        _, discounted_occupancy_integral = integral(r)
+
+        # per-unit-time rates of accruing cost, utility, polyps, treatments and deaths in each state
+        cost_rates = tables.annualCosts + jump_rates @ tables.oneTimeCosts
+        utility_rates = tables.annualUtilities
+        polyp_rates = jump_rates @ tables.ifPolyp
+        treatment_rates = jump_rates @ tables.ifTreatment
+
+        # solve the forward equations
+        occupancy = np.zeros((n_steps + 1, n_states))
+        occupancy[0, tables.initialStateIndex] = 1
+        cost = utility = n_polyps = n_treatments = time_dead = 0
+        for k in range(n_steps):
+            p = occupancy[k]
+            discount = np.exp(-r * self.times[k])
+            p_discounted = discount * p @ discounted_occupancy_integral
+            p_integral = p @ occupancy_integral
+
+            cost += p_discounted @ cost_rates
+            utility += p_discounted @ utility_rates
+            n_polyps += p_integral @ polyp_rates
+            n_treatments += p_integral @ treatment_rates
+            time_dead += p_integral @ tables.ifDeath
+
+            occupancy[k + 1] = p @ trans_probs
+
+        # as in PatientStateMonitor, patients who are alive at the end of the simulation are
+        # recorded as entering their current state
+        p_end = occupancy[-1]
+        cost += np.exp(-r * sim_length) * p_end @ tables.oneTimeCosts
+        n_polyps += p_end @ tables.ifPolyp
+        n_treatments += p_end @ tables.ifTreatment
+
+        self.stateOccupancy = occupancy
+        self.survivalCurve = 1 - occupancy @ tables.ifDeath
+        self.expectedCost = cost
+        self.expectedUtility = utility
+        self.expectedNPolyps = n_polyps
+        self.expectedNTreatments = n_treatments
+
+        # mean survival time of patients who die during the simulation: E[T | T <= sim_length]
+        # (E[T; T <= sim_length] = sim_length * P(T <= sim_length) - integral of P(T <= t))
+        self.probDeath = 1 - self.survivalCurve[-1]
+        if self.probDeath > 0:
+            self.meanSurvivalTime = (sim_length * self.probDeath - time_dead) / self.probDeath
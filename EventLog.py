@@ -0,0 +1,129 @@
+import os
+import uuid
+from array import array
+import numpy as np
+
+
+# columns of the event log: (name, type code of the in-memory buffer, NumPy data type)
+COLUMNS = [
+    ('patient_ids', 'q', np.int64),
+    ('times', 'd', np.float64),
+    ('from_states', 'b', np.int8),
+    ('to_states', 'b', np.int8)
+]
+
+
+class EventLog:
+    def __init__(self, max_events_in_memory=2 ** 22, directory=None):
+        """ log of the events (patient id, time, state before, state after) of a simulated cohort
+        stored in compact typed buffers (about 18 bytes per event) instead of Python objects
+        (the patient ids are the ids of Patient objects, i.e. cohort id * pop_size + index of the patient;
+        an event with the same state before and after at the simulation length marks the end of the simulation)
+        :param max_events_in_memory: maximum number of events kept in memory; when the buffers are full,
+            the events are written to a file in the directory and the buffers are emptied
+        :param directory: directory to write the full buffers to
+            (a MemoryError is raised when the buffers are full if None; several event logs can share
+            a directory since the files of each log are named with a token of the log)
+        """
+
+        self.maxEventsInMemory = max_events_in_memory
+        self.directory = directory
+        self.fileToken = uuid.uuid4().hex  # prefix of the names of the files of this log
+        self.nEvents = 0  # number of recorded events
+        self.chunkFileNames = []  # files of the events written to the directory
+
+        self.patientIDs = array('q')
+        self.times = array('d')
+        self.fromStates = array('b')
+        self.toStates = array('b')
+
+    def record(self, patient_id, time, from_state, to_state):
+        """ records an event
+        :param patient_id: id of the patient
+        :param time: time of the event
+        :param from_state: index of the health state before the event
+        :param to_state: index of the health state after the event
+        """
+
+        self.patientIDs.append(patient_id)
+        self.times.append(time)
+        self.fromStates.append(from_state)
+        self.toStates.append(to_state)
+        self.nEvents += 1
+
+        if len(self.times) >= self.maxEventsInMemory:
+            self.spill()
+
+    def record_array(self, patient_ids, times, from_states, to_states):
+        """ records the events of several patients (see record)
+        :param patient_ids: array of patient ids
+        :param times: array of event times
+        :param from_states: array of the indices of health states before the events
+        :param to_states: array of the indices of health states after the events
+        """
+
+        for buffer, values, (_, _, data_type) in zip(self.get_buffers(),
+                                                     (patient_ids, times, from_states, to_states),
+                                                     COLUMNS):
+            buffer.frombytes(np.asarray(values, dtype=data_type).tobytes())
+        self.nEvents += len(times)
+
+        if len(self.times) >= self.maxEventsInMemory:
+            self.spill()
+
+    def get_buffers(self):
+        return self.patientIDs, self.times, self.fromStates, self.toStates
+
+    def spill(self):
+        """ writes the events in memory to a new file in the directory and empties the buffers """
+
+        if self.directory is None:
+            raise MemoryError('The event log has more than {} events in memory; '
+                              'set a directory to write the events to.'.format(self.maxEventsInMemory))
+
+        os.makedirs(self.directory, exist_ok=True)
+        file_name = os.path.join(self.directory,
+                                 'events_{}_{:05d}.npz'.format(self.fileToken, len(self.chunkFileNames)))
+        np.savez(file_name, **self.get_events_in_memory())
+        self.chunkFileNames.append(file_name)
+
+        for buffer in self.get_buffers():
+            del buffer[:]
+
+    def get_events_in_memory(self):
+        """ :returns: dictionary of the arrays of events in memory
+        (copies, since the buffers cannot grow while NumPy arrays share their memory)
+        """
+
+        events = {}
+        for buffer, (name, _, data_type) in zip(self.get_buffers(), COLUMNS):
+            events[name] = np.frombuffer(buffer, dtype=data_type).copy() if len(buffer) > 0 \
+                else np.empty(0, dtype=data_type)
+        return events
+
+    def get_events(self):
+        """ :returns: dictionary of the arrays of all recorded events (in the order of recording)
+            with keys 'patient_ids', 'times', 'from_states' and 'to_states'
+        """
+
+        chunks = []
+        for file_name in self.chunkFileNames:
+            with np.load(file_name) as data:
+                chunks.append({name: data[name] for name, _, _ in COLUMNS})
+        chunks.append(self.get_events_in_memory())
+
+        return {name: np.concatenate([chunk[name] for chunk in chunks]) for name, _, _ in COLUMNS}
+
+    def save(self, file_name):
+        """ saves all recorded events in a .npz file (see load_events) """
+
+        np.savez(file_name, **self.get_events())
+
+
+def load_events(file_name):
+    """ :returns: dictionary of the arrays of events saved by EventLog.save
+    :param file_name: name of the .npz file
+    """
+
+    with np.load(file_name) as data:
+        return {name: data[name] for name, _, _ in COLUMNS}
@@ -5,6 +5,8 @@ POP_SIZE = 1000         # cohort population size
 SIM_TIME_STEPS = 30    # length of simulation (years)
 ALPHA = 0.05        # significance level for calculating confidence intervals
 DISCOUNT = 0.03     # annual discount rate
+IF_PAIRED = False    # set to True to simulate strategies with common random numbers and compare them patient by patient
+IF_USE_CACHE = False  # set to True to reuse cohorts simulated by earlier runs (stored in the SimulationCache directory)
 
 # annual costs for each status
 FIT_COST = 17.7
@@ -81,6 +83,20 @@ ANNUAL_STATE_COST = [
     0,           # TREATMENT
     ]
 
-print('Transition probability matrix without screening at 45:', TRANS45_NoScreen_MATRIX)
-print('Transition probability matrix with screening at 45:', TRANS45_Screen_MATRIX)
-print('')
+# one-time cost of entering each health state
+ONE_TIME_STATE_COST = [
+    0,           # WELL
+    1823,           # SMALL
+    1823,           # LARGE
+    64986,        # CRC
+    0,           # CRC_DEATH
+    0,           # NATUAL_DEATH
+    0,           # SCREEN_NO_DISEASE
+    0,           # SCREEN_DISEASE
+    1278,        # TREATMENT
+    ]
+
+if __name__ == '__main__':
+    print('Transition probability matrix without screening at 45:', TRANS45_NoScreen_MATRIX)
+    print('Transition probability matrix with screening at 45:', TRANS45_Screen_MATRIX)
+    print('')
@@ -0,0 +1,93 @@
+import contextlib
+import time
+import numpy as np
+
+
+class SimulationReport:
+    def __init__(self, health_states):
+        """ counts the events and times the phases of simulated cohorts
+        (pass it as the report of Cohort.simulate; one report can collect several cohorts,
+        and other phases, e.g. reporting, can be timed with time_phase)
+        :param health_states: the HealthStates of the model (to name the transitions)
+        """
+
+        self.healthStates = health_states
+        self.nCohorts = 0  # number of simulated cohorts
+        self.nPatients = 0  # number of simulated patients
+        # number of events from each state (row) to each state (column); staying in the current
+        # state at the end of the simulation is counted as an event into the current state
+        self.transitionCounts = np.zeros((len(health_states), len(health_states)), dtype=np.int64)
+        self.phaseTimes = {}  # wall time (seconds) of each phase in the order the phases first ran
+
+    def add_cohort(self, pop_size, transition_counts=None):
+        """ adds a simulated cohort to the report
+        :param pop_size: population size of the cohort
+        :param transition_counts: matrix of the number of events of the cohort from each state to each state
+            (None if the events were not simulated, e.g. the outcomes were loaded from a cache)
+        """
+
+        self.nCohorts += 1
+        self.nPatients += pop_size
+        if transition_counts is not None:
+            self.transitionCounts += transition_counts
+
+    def add_time(self, phase, seconds):
+        """ adds wall time to a phase
+        :param phase: name of the phase
+        :param seconds: wall time in seconds
+        """
+
+        self.phaseTimes[phase] = self.phaseTimes.get(phase, 0) + seconds
+
+    @contextlib.contextmanager
+    def time_phase(self, phase):
+        """ times the code in a with statement as a phase
+        :param phase: name of the phase
+        """
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(phase=phase, seconds=time.perf_counter() - start)
+
+    def get_n_events(self):
+        """ :returns: total number of events """
+
+        return int(self.transitionCounts.sum())
+
+    def get_mean_events_per_patient(self):
+        """ :returns: mean number of events per simulated patient """
+
+        if self.nPatients == 0:
+            return 0
+        return self.get_n_events() / self.nPatients
+
+    def get_transitions(self):
+        """ :returns: list of (state before, state after, number of events) of the transitions that occurred,
+            the most frequent first
+        """
+
+        from_states, to_states = np.nonzero(self.transitionCounts)
+        transitions = [(self.healthStates(int(i)), self.healthStates(int(j)), int(self.transitionCounts[i, j]))
+                       for i, j in zip(from_states, to_states)]
+        transitions.sort(key=lambda transition: -transition[2])
+        return transitions
+
+    def print_summary(self):
+        """ prints the number of events, the events per transition and the wall time of each phase """
+
+        n_events = self.get_n_events()
+        print('Simulated cohorts and patients:', self.nCohorts, ',', '{:,}'.format(self.nPatients))
+        print('Number of events:', '{:,}'.format(n_events))
+        print('Mean number of events per patient:', '{:.2f}'.format(self.get_mean_events_per_patient()))
+
+        print('Events per transition:')
+        for from_state, to_state, count in self.get_transitions():
+            print('  {:>20s} -> {:20s} {:>14,d} ({:.1%})'.format(from_state.name, to_state.name, count,
+                                                                  count / n_events))
+
+        print('Wall time per phase:')
+        total_time = sum(self.phaseTimes.values())
+        for phase, seconds in self.phaseTimes.items():
+            print('  {:20s} {:10.3f} s ({:.1%})'.format(phase, seconds, seconds / total_time if total_time > 0 else 0))
@@ -1,10 +1,20 @@
+import contextlib
+import functools
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 
-import SimPy.Markov as Markov
 import SimPy.SamplePath as Path
-from InputData45Screen import HealthStates
-import SimPy.EconEval as Econ
 import SimPy.Statistics as Stat
+import VectorizedModel
+import CompiledModel
+import EventLog
+import OutcomeRegistry
+import Trajectories
+from StreamingStatistics import OnlineStat
+
+
+# number of patients whose events are generated at once by the per-patient engines (see simulate_patients)
+PATIENTS_PER_BLOCK = 4096
 
 
 class Patient:
@@ -23,8 +33,8 @@ class Patient:
 
         # random number generator for this patient
         rng = np.random.RandomState(seed=self.id)
-        # gillespie algorithm
-        gillespie = Markov.Gillespie(transition_rate_matrix=self.params.transRateMatrix)
+        # gillespie algorithm (exit rates and jump probabilities precomputed in the parameters)
+        gillespie = self.params.transTables
 
         t = 0  # simulation time
         if_stop = False
@@ -35,7 +45,7 @@ class Patient:
             # (note that the gillespie algorithm returns None for dt if the process
             # is in an absorbing state)
             dt, new_state_index = gillespie.get_next_state(
-                current_state_index=self.stateMonitor.currentState.value,
+                current_state_index=self.stateMonitor.currentStateIndex,
                 rng=rng)
 
             # stop if time to next event (dt) is None (i.e. we have reached an absorbing state)
@@ -48,50 +58,60 @@ class Patient:
                     # advance time to the end of the simulation and stop
                     t = sim_length
                     # the individual stays in the current state until the end of the simulation
-                    new_state_index = self.stateMonitor.currentState.value
+                    new_state_index = self.stateMonitor.currentStateIndex
                     if_stop = True
                 else:
                     # advance time to the time of next event
                     t += dt
                 # update health state
-                self.stateMonitor.update(time=t, new_state=HealthStates(new_state_index))
+                self.stateMonitor.update(time=t, new_state_index=new_state_index)
 
 
 class PatientStateMonitor:
 
     def __init__(self, parameters):
 
-        self.currentState = parameters.initialHealthState     # assuming everyone starts in "Well"
+        self.healthStates = parameters.healthStates
+        # kinds of health states indexed by state (the state is tracked as an integer code)
+        self.stateTables = parameters.stateTables
+        self.currentStateIndex = parameters.initialHealthState.value     # assuming everyone starts in "Well"
         self.survivalTime = None
         self.nPolyps = 0
         self.nTreatments = 0
         self.costUtilityMonitor = PatientCostUtilityMonitor(parameters=parameters)
 
-    def update(self, time, new_state):
+    def get_current_state(self):
+        """ :returns: the current health state (as a member of HealthStates) """
+
+        return self.healthStates(self.currentStateIndex)
+
+    def update(self, time, new_state_index):
         """
         update the current health state to the new health state
         :param time: current time
-        :param new_state: new state
+        :param new_state_index: index of the new state
         """
 
+        tables = self.stateTables
+
         # update survival time
-        if new_state in (HealthStates.CRC_DEATH, HealthStates.NATURAL_DEATH):
+        if tables.ifDeath[new_state_index]:
             self.survivalTime = time
 
         # update number of strokes
-        if new_state in (HealthStates.SMALL, HealthStates.LARGE):
+        if tables.ifPolyp[new_state_index]:
             self.nPolyps += 1
 
-        if new_state == HealthStates.TREATMENT:
+        if tables.ifTreatment[new_state_index]:
             self.nTreatments += 1
 
         # update cost and utility
         self.costUtilityMonitor.update(time=time,
-                                       current_state=self.currentState,
-                                       next_state=new_state)
+                                       current_state_index=self.currentStateIndex,
+                                       next_state_index=new_state_index)
 
         # update current health state
-        self.currentState = new_state
+        self.currentStateIndex = new_state_index
 
 
 class PatientCostUtilityMonitor:
@@ -102,136 +122,873 @@ class PatientCostUtilityMonitor:
 
         # model parameters for this patient
         self.params = parameters
-
-        # total cost and utility
-        self.totalDiscountedCost = 0
-        self.totalDiscountedUtility = 0
-
-    def update(self, time, current_state, next_state):
+        # per-state costs and utilities shared by all patients
+        self.tables = parameters.costUtilityTables
+
+        # total cost and utility at each discount rate (see CostUtilityTables.rates)
+        self.discountedCosts = np.zeros(len(self.tables.rates))
+        self.discountedUtilities = np.zeros(len(self.tables.rates))
+
+    @property
+    def totalDiscountedCost(self):
+        """ total discounted cost """
+        return float(self.discountedCosts[0])
+
+    @property
+    def totalDiscountedUtility(self):
+        """ total discounted utility """
+        return float(self.discountedUtilities[0])
+
+    @property
+    def totalDiscountedCosts(self):
+        """ total cost at the other discount rates (see CostUtilityTables.discountRates) """
+        return self.discountedCosts[1:].tolist()
+
+    @property
+    def totalDiscountedUtilities(self):
+        """ total utility at the other discount rates (see CostUtilityTables.discountRates) """
+        return self.discountedUtilities[1:].tolist()
+
+    def update(self, time, current_state_index, next_state_index):
         """ updates the discounted total cost and health utility
         :param time: simulation time
-        :param current_state: current health state
-        :param next_state: next health state
+        :param current_state_index: index of the current health state
+        :param next_state_index: index of the next health state
         """
 
         # cost and utility (per unit of time) during the period since the last recording until now
-        if current_state in (HealthStates.SCREEN_NO_DISEASE, HealthStates.SCREEN_DISEASE):
-            cost = self.params.annualStateCosts[current_state.value] + self.params.annualTreatmentCost
-        else:
-            cost = self.params.annualStateCosts[current_state.value]
-        utility = self.params.annualStateUtilities[current_state.value]
-
-        # discounted cost and utility (continuously compounded)
-        discounted_cost = Econ.pv_continuous_payment(payment=cost,
-                                                     discount_rate=self.params.discountRate,
-                                                     discount_period=(self.tLastRecorded, time))
-        discounted_utility = Econ.pv_continuous_payment(payment=utility,
-                                                        discount_rate=self.params.discountRate,
-                                                        discount_period=(self.tLastRecorded, time))
-        if next_state in (HealthStates.SMALL, HealthStates.LARGE):
-            discounted_cost += Econ.pv_single_payment(payment=1823, discount_rate=0.03,
-                                                      discount_period=time,
-                                                      discount_continuously=True)
-        if next_state == HealthStates.CRC:
-            discounted_cost += Econ.pv_single_payment(payment=64986, discount_rate=0.03,
-                                                      discount_period=time,
-                                                      discount_continuously=True)
-
-        if next_state == HealthStates.TREATMENT:
-            discounted_cost += Econ.pv_single_payment(payment=1278, discount_rate=0.03,
-                                                      discount_period=time,
-                                                      discount_continuously=True)
-        # if we want to add stroke into the model, stroke is one time thing
-        '''Econ.pv_single_payment(payment=1000, discount_rate=0.03,
-                               discount_period=time,
-                               discount_continuously=True) '''
-
-        # update total discounted cost and utility
-        self.totalDiscountedCost += discounted_cost
-        self.totalDiscountedUtility += discounted_utility
+        # and the one-time cost of entering the next state at every discount rate
+        # (if we want to add stroke into the model, stroke is one time thing)
+        costs, utilities = self.tables.get_accruals(t_last=self.tLastRecorded,
+                                                    t=time,
+                                                    from_states=current_state_index,
+                                                    to_states=next_state_index)
+        self.discountedCosts += costs
+        self.discountedUtilities += utilities
 
         # update the time since last recording to the current time
         self.tLastRecorded = time
 
 
+class PatientSimulator:
+    """ simulates patients one after the other without creating Patient and monitor objects
+    (the same random numbers as Patient.simulate); only the events of the patients are generated here and
+    their outcomes are calculated afterwards with array operations (see Trajectories.CohortTrajectories),
+    so the outcomes are identical to simulating Patient objects """
+
+    __slots__ = ('transTables', 'initialStateIndex', 'rng')
+
+    def __init__(self, parameters):
+        """
+        :param parameters: parameters of the model
+        """
+
+        self.transTables = parameters.transTables
+        self.initialStateIndex = parameters.initialHealthState.value
+        # random number generator that is re-seeded for each patient
+        # (re-seeding is much faster than creating a new generator)
+        self.rng = np.random.RandomState()
+
+    def simulate(self, first_patient_id, n_patients, sim_length):
+        """ simulates patients over the specified simulation length
+        :param first_patient_id: ID of the first patient (patient ids, the seeds of the patients' random numbers,
+            are first_patient_id, first_patient_id + 1, ...)
+        :param n_patients: number of patients to simulate
+        :param sim_length: simulation length
+        :returns: (index of the patient (0, 1, ...), time, state before and state after) of each event
+            as NumPy arrays (the events of each patient in the order of time, patient after patient)
+        """
+
+        rng = self.rng
+        get_next_state = self.transTables.get_next_state
+        patient_indices = []
+        times = []
+        from_states = []
+        to_states = []
+
+        for k in range(n_patients):
+            rng.seed(first_patient_id + k)
+            state = self.initialStateIndex
+            t = 0
+
+            while True:
+                # time until the next event (None if the current state is absorbing) and the next state
+                dt, new_state = get_next_state(current_state_index=state, rng=rng)
+                if dt is None:
+                    break
+
+                # if the next event occurs beyond the simulation length,
+                # the patient stays in the current state until the end of the simulation
+                if_end = dt + t > sim_length
+                if if_end:
+                    t = sim_length
+                    new_state = state
+                else:
+                    t += dt
+
+                patient_indices.append(k)
+                times.append(t)
+                from_states.append(state)
+                to_states.append(new_state)
+
+                state = new_state
+                if if_end:
+                    break
+
+        return np.array(patient_indices, dtype=np.int64), np.array(times, dtype=float), \
+            np.array(from_states, dtype=np.int64), np.array(to_states, dtype=np.int64)
+
+
 class Cohort:
 
-    def __init__(self, id, pop_size, parameters):
+    def __init__(self, id, pop_size, parameters, outcome_storage='list', if_record_transitions=False):
         """ create a cohort of patients
         :param id: cohort ID
         :param pop_size: population size of this cohort
         :param trans_rate_matrix: transition rate matrix
+        :param outcome_storage: how patient outcomes are stored ('list', 'array' or 'stream', see CohortOutcomes)
+        :param if_record_transitions: set to True to record the transition counts and residence times
+            of each patient (to calculate the outcomes of OutcomeRegistry, see CohortOutcomes.get_outcome)
         """
         self.id = id
         self.popSize = pop_size
         self.params = parameters
-        self.cohortOutcomes = CohortOutcomes()
-
-    def simulate(self, sim_length):
+        self.ifRecordTransitions = if_record_transitions
+        self.cohortOutcomes = CohortOutcomes(storage=outcome_storage, pop_size=pop_size,
+                                             discount_rates=parameters.costUtilityTables.discountRates,
+                                             health_states=parameters.healthStates if if_record_transitions
+                                             else None)
+
+    def simulate(self, sim_length, if_vectorized=False, n_processes=1, cache=None, event_log=None,
+                 if_compiled=False, report=None):
         """ simulate the cohort of patients over the specified number of time-steps
         :param sim_length: simulation length
+        :param if_vectorized: set to True to simulate all patients in lockstep with NumPy
+            (see VectorizedModel) instead of simulating one Patient object at a time
+            (cohorts with the same id then do not have common random numbers patient by patient,
+            so use the per-patient engines for paired comparisons of strategies)
+        :param n_processes: number of processes to simulate the patients in parallel
+            (the results are identical to simulating the patients in a single process)
+        :param cache: ResultCache to reuse the outcomes of an identical cohort simulated earlier
+            (outcomes are not added to the cache when they are stored as 'stream')
+        :param event_log: EventLog to record the events of all patients in (events are not recorded if None;
+            a cached cohort is simulated again to record its events)
+        :param if_compiled: set to True to simulate patients with the compiled kernel (see CompiledModel;
+            the outcomes are identical to simulating Patient objects; PatientSimulator is used if numba is
+            not installed)
+        :param report: Instrumentation.SimulationReport to count the events of the patients in and to time
+            the phases of the simulation ('cache', 'simulation' and 'statistics') in (not instrumented if None)
         """
 
-        # populate and simulate the cohort
-        for i in range(self.popSize):
-            # create a new patient (use id * pop_size + n as patient id)
-            patient = Patient(id=self.id * self.popSize + i,
-                              parameters=self.params)
-            # simulate
-            patient.simulate(sim_length)
+        if event_log is not None and n_processes > 1 and not if_vectorized:
+            raise ValueError('Events can only be recorded when the cohort is simulated in a single process.')
 
-            # store outputs of this simulation
-            self.cohortOutcomes.extract_outcome(simulated_patient=patient)
+        # timer of the phases of the simulation (does nothing if not instrumented)
+        if report is None:
+            time_phase = _do_not_time_phase
+            transition_counts = None
+        else:
+            time_phase = report.time_phase
+            transition_counts = np.zeros((len(self.params.healthStates), len(self.params.healthStates)),
+                                         dtype=np.int64)
+
+        # reuse the outcomes of an identical cohort if it is in the cache
+        if cache is not None:
+            key = cache.get_key(parameters=self.params,
+                                pop_size=self.popSize,
+                                sim_length=sim_length,
+                                cohort_id=self.id,
+                                if_vectorized=if_vectorized,
+                                storage=self.cohortOutcomes.storage)
+            with time_phase('cache'):
+                cached_outcomes = cache.load(key=key) if event_log is None else None
+            # (cohorts cached without their transitions are simulated again if transitions are recorded)
+            if cached_outcomes is not None and self.ifRecordTransitions and 'transition_counts' not in cached_outcomes:
+                cached_outcomes = None
+            if cached_outcomes is not None:
+                self.cohortOutcomes.extract_cohort_outcomes(**cached_outcomes)
+                with time_phase('statistics'):
+                    self.cohortOutcomes.calculate_cohort_outcomes(initial_pop_size=self.popSize)
+                # the events of cached cohorts are not counted
+                if report is not None:
+                    report.add_cohort(pop_size=self.popSize)
+                return
+
+        with time_phase('simulation'):
+            self._simulate_patients(sim_length=sim_length,
+                                    if_vectorized=if_vectorized,
+                                    n_processes=n_processes,
+                                    event_log=event_log,
+                                    if_compiled=if_compiled,
+                                    transition_counts=transition_counts)
 
         # calculate cohort outcomes
-        self.cohortOutcomes.calculate_cohort_outcomes(initial_pop_size=self.popSize)
+        with time_phase('statistics'):
+            self.cohortOutcomes.calculate_cohort_outcomes(initial_pop_size=self.popSize)
+        if report is not None:
+            report.add_cohort(pop_size=self.popSize, transition_counts=transition_counts)
+
+        # store the outcomes in the cache
+        if cache is not None and self.cohortOutcomes.storage != 'stream':
+            with time_phase('cache'):
+                cache.save(key=key,
+                           outcomes={'survival_times': self.cohortOutcomes.survivalTimes,
+                                     'n_polyps': self.cohortOutcomes.nTotalPolyps,
+                                     'n_treatments': self.cohortOutcomes.NTreatments,
+                                     'costs': self.cohortOutcomes.costs,
+                                     'utilities': self.cohortOutcomes.utilities,
+                                     'life_years': self.cohortOutcomes.lifeYears,
+                                     'costs_by_rate': self.cohortOutcomes.costsByRate,
+                                     'utilities_by_rate': self.cohortOutcomes.utilitiesByRate,
+                                     'transition_counts': self.cohortOutcomes.transitionCounts,
+                                     'residence_times': self.cohortOutcomes.residenceTimes})
+
+    def simulate_horizons(self, horizons, if_vectorized=False, event_log=None):
+        """ simulates the cohort once until the longest horizon and calculates the outcomes of the patients
+        at each horizon from their recorded events (see Trajectories.CohortTrajectories.truncate)
+        (the outcomes of the per-patient engines at each horizon are the outcomes of simulating the cohort
+        until that horizon; with the vectorized engine they differ since its random numbers are drawn
+        for all active patients at once)
+        :param horizons: list of horizons (simulation lengths)
+        :param if_vectorized: set to True to simulate all patients in lockstep with NumPy (see simulate)
+        :param event_log: EventLog to record the events of all patients in (a new EventLog if None)
+        :returns: dictionary of the CohortOutcomes ('array' storage) at each horizon
+            (cohortOutcomes has the outcomes at the longest horizon)
+        """
+
+        if event_log is None:
+            event_log = EventLog.EventLog(max_events_in_memory=2 ** 40)
+        n_events = event_log.nEvents
+
+        # simulate until the longest horizon
+        self.simulate(sim_length=max(horizons), if_vectorized=if_vectorized, event_log=event_log)
+
+        # outcomes at each horizon from the events of this cohort
+        events = {name: values[n_events:] for name, values in event_log.get_events().items()}
+        trajectories = Trajectories.CohortTrajectories(events=events,
+                                                       cohort_id=self.id,
+                                                       pop_size=self.popSize,
+                                                       n_states=len(self.params.healthStates))
+        return trajectories.get_horizon_outcomes(horizons=horizons, parameters=self.params)
+
+    def _simulate_patients(self, sim_length, if_vectorized, n_processes, event_log, if_compiled, transition_counts):
+        """ simulates the patients of the cohort with the selected engine and stores their outcomes
+        (see simulate; the events of the patients are counted in transition_counts if it is not None)
+        """
+
+        if if_vectorized:
+            # simulate the whole cohort at once (use the cohort id as the seed)
+            survival_times, n_polyps, n_treatments, costs, utilities, costs_by_rate, utilities_by_rate, \
+                life_years, patient_transition_counts, residence_times = VectorizedModel.simulate_cohort(
+                parameters=self.params,
+                pop_size=self.popSize,
+                sim_length=sim_length,
+                seed=self.id,
+                event_log=event_log,
+                transition_counts=transition_counts,
+                if_record_transitions=self.ifRecordTransitions)
+
+            # store outputs of this simulation
+            self.cohortOutcomes.extract_cohort_outcomes(survival_times=survival_times,
+                                                        n_polyps=n_polyps,
+                                                        n_treatments=n_treatments,
+                                                        costs=costs,
+                                                        utilities=utilities,
+                                                        life_years=life_years,
+                                                        costs_by_rate=costs_by_rate,
+                                                        utilities_by_rate=utilities_by_rate,
+                                                        transition_counts=patient_transition_counts,
+                                                        residence_times=residence_times)
+        elif n_processes > 1:
+            # split the patients into contiguous shards (one per process)
+            bounds = np.linspace(0, self.popSize, min(n_processes, self.popSize) + 1).astype(int)
+
+            # simulate the shards in parallel and merge their outcomes in the order of patient ids
+            # (the events of a shard are counted in its process and returned with its outcomes)
+            with ProcessPoolExecutor(max_workers=n_processes) as executor:
+                shard_results = executor.map(functools.partial(simulate_patients if transition_counts is None
+                                                               else simulate_and_count_patients,
+                                                               if_record_transitions=self.ifRecordTransitions),
+                                              [self.id] * (len(bounds) - 1),
+                                              [self.popSize] * (len(bounds) - 1),
+                                              [self.params] * (len(bounds) - 1),
+                                              [sim_length] * (len(bounds) - 1),
+                                              bounds[:-1],
+                                              bounds[1:],
+                                              [self.cohortOutcomes.storage] * (len(bounds) - 1),
+                                              [None] * (len(bounds) - 1),
+                                              [if_compiled] * (len(bounds) - 1))
+                for result in shard_results:
+                    if transition_counts is None:
+                        outcomes = result
+                    else:
+                        outcomes, shard_counts = result
+                        transition_counts += shard_counts
+                    self.cohortOutcomes.extend(other=outcomes)
+        else:
+            # populate and simulate the cohort
+            self.cohortOutcomes.extend(other=simulate_patients(cohort_id=self.id,
+                                                               pop_size=self.popSize,
+                                                               parameters=self.params,
+                                                               sim_length=sim_length,
+                                                               first_index=0,
+                                                               last_index=self.popSize,
+                                                               storage=self.cohortOutcomes.storage,
+                                                               event_log=event_log,
+                                                               if_compiled=if_compiled,
+                                                               transition_counts=transition_counts,
+                                                               if_record_transitions=self.ifRecordTransitions))
+
+
+def _do_not_time_phase(phase):
+    """ a timer of phases for simulations that are not instrumented """
+
+    return contextlib.nullcontext()
+
+
+def simulate_patients(cohort_id, pop_size, parameters, sim_length, first_index, last_index, storage='list',
+                      event_log=None, if_compiled=False, transition_counts=None, if_record_transitions=False):
+    """ simulates the patients of a cohort with indices first_index, ..., last_index - 1
+    (defined at the module level so that shards of a cohort can be simulated by a process pool)
+    :param cohort_id: cohort ID
+    :param pop_size: population size of the cohort
+    :param parameters: parameters of the model
+    :param sim_length: simulation length
+    :param first_index: index of the first patient to simulate
+    :param last_index: index after the last patient to simulate
+    :param storage: how patient outcomes are stored ('list', 'array' or 'stream', see CohortOutcomes)
+    :param event_log: EventLog to record the events of the patients in (events are not recorded if None)
+    :param if_compiled: set to True to simulate the patients with the compiled kernel (see CompiledModel)
+    :param transition_counts: NumPy matrix to add the number of events of the patients
+        from each state (row) to each state (column) to (events are not counted if None)
+    :param if_record_transitions: set to True to record the transition counts and residence times of each patient
+    :returns: CohortOutcomes of the simulated patients (summary statistics not calculated)
+    """
+
+    outcomes = CohortOutcomes(storage=storage, pop_size=last_index - first_index,
+                              discount_rates=parameters.costUtilityTables.discountRates,
+                              health_states=parameters.healthStates if if_record_transitions else None)
+
+    # generate the events of blocks of patients on integer state codes
+    # and calculate the outcomes of the patients of each block from their events
+    if if_compiled and CompiledModel.IF_COMPILED:
+        simulate_events = functools.partial(CompiledModel.simulate_patients, parameters=parameters)
+    else:
+        simulate_events = PatientSimulator(parameters=parameters).simulate
+    for first in range(first_index, last_index, PATIENTS_PER_BLOCK):
+        n_patients = min(PATIENTS_PER_BLOCK, last_index - first)
+        patient_indices, times, from_states, to_states = simulate_events(
+            first_patient_id=cohort_id * pop_size + first,
+            n_patients=n_patients,
+            sim_length=sim_length)
+
+        if event_log is not None:
+            event_log.record_array(patient_ids=cohort_id * pop_size + first + patient_indices,
+                                   times=times,
+                                   from_states=from_states,
+                                   to_states=to_states)
+        if transition_counts is not None:
+            np.add.at(transition_counts, (from_states, to_states), 1)
+
+        # (the patients of the block as a cohort of their own, with patient ids 0, 1, ...)
+        trajectories = Trajectories.CohortTrajectories(events={'patient_ids': patient_indices,
+                                                               'times': times,
+                                                               'from_states': from_states,
+                                                               'to_states': to_states},
+                                                       cohort_id=0,
+                                                       pop_size=n_patients,
+                                                       n_states=len(parameters.healthStates))
+        block_outcomes = trajectories.get_outcomes(parameters=parameters,
+                                                   if_record_transitions=if_record_transitions)
+        if storage == 'list':
+            for name in ('survival_times', 'n_polyps', 'n_treatments', 'costs', 'utilities', 'life_years',
+                         'costs_by_rate', 'utilities_by_rate'):
+                block_outcomes[name] = block_outcomes[name].tolist()
+        block = CohortOutcomes(storage=storage, pop_size=n_patients,
+                               discount_rates=parameters.costUtilityTables.discountRates,
+                               health_states=parameters.healthStates if if_record_transitions else None)
+        block.extract_cohort_outcomes(**block_outcomes)
+        outcomes.extend(other=block)
+
+    return outcomes
+
+
+def simulate_and_count_patients(cohort_id, pop_size, parameters, sim_length, first_index, last_index,
+                                storage='list', event_log=None, if_compiled=False, if_record_transitions=False):
+    """ simulates the patients of a cohort and counts their events (see simulate_patients;
+    for process pools, where the counts cannot be added to a matrix of the parent process)
+    :returns: (CohortOutcomes of the simulated patients, matrix of the number of events
+               from each state (row) to each state (column))
+    """
+
+    transition_counts = np.zeros((len(parameters.healthStates), len(parameters.healthStates)), dtype=np.int64)
+    outcomes = simulate_patients(cohort_id=cohort_id, pop_size=pop_size, parameters=parameters,
+                                 sim_length=sim_length, first_index=first_index, last_index=last_index,
+                                 storage=storage, event_log=event_log, if_compiled=if_compiled,
+                                 transition_counts=transition_counts, if_record_transitions=if_record_transitions)
+    return outcomes, transition_counts
+
+
+# outcomes of patients: outcome -> (attribute of the observations, attribute of the summary statistics)
+OUTCOME_ATTRIBUTES = {
+    'survival_time': ('survivalTimes', 'statSurvivalTime'),
+    'n_polyps': ('nTotalPolyps', 'statNPolyps'),
+    'n_treatments': ('NTreatments', 'statNTreatments'),
+    'cost': ('costs', 'statCost'),
+    'utility': ('utilities', 'statUtility'),
+    'life_years': ('lifeYears', 'statLifeYears')
+}
 
 
 class CohortOutcomes:
-    def __init__(self):
+    def __init__(self, storage='list', pop_size=None, discount_rates=(), health_states=None):
+        """
+        :param storage: how patient outcomes are stored:
+            'list': Python lists of observations,
+            'array': NumPy arrays preallocated for pop_size patients (8 bytes per survival time,
+                cost and utility and 4 bytes per count),
+            'stream': summary statistics (and histograms of survival times and counts) updated as
+                patients are recorded without storing observations (so the observations are not
+                available to Econ.CEA/CBA or to comparisons of strategies)
+        :param pop_size: number of patients (required for 'array')
+        :param discount_rates: other discount rates at which the costs and utilities of patients are recorded
+            (see CostUtilityTables.discountRates, get_costs and get_utilities)
+        :param health_states: HealthStates of the model to record the transition counts (4 bytes per pair of
+            states) and the residence times (8 bytes per state) of each patient (not recorded if None;
+            see get_outcome)
+        """
+
+        self.storage = storage
+        self.discountRates = list(discount_rates)
+        self.healthStates = health_states
+        self.nPatients = 0  # number of recorded patients
+        self.nDeaths = 0  # number of recorded patients who died
 
         self.survivalTimes = []
         self.nTotalPolyps = []
         self.NTreatments = []
-        self.nLivingPatients = None
         self.costs = []  # patients' discounted costs
         self.utilities = []  # patients' discounted utilities
-
-        self.statSurvivalTime = None  # summary statistics for survival time
-        self.statNPolyps = None
-        self.statNTreatments = None
-        self.statCost = None  # summary statistics for discounted cost
-        self.statUtility = None  # summary statistics for discounted utility
+        self.lifeYears = []  # patients' undiscounted life-years (time alive during the simulation)
+        self.costsByRate = []  # patients' costs discounted at each of discountRates (a row per patient)
+        self.utilitiesByRate = []  # patients' utilities discounted at each of discountRates (a row per patient)
+        self.transitionCounts = None  # patients' number of events from each state to each state (if recorded)
+        self.residenceTimes = None  # patients' time spent in each state (if recorded)
+        if health_states is not None:
+            if storage == 'stream':
+                raise ValueError('Transitions of patients cannot be recorded for \'stream\' storage.')
+            self.transitionCounts = []
+            self.residenceTimes = []
+
+        # summary statistics and survival curve calculated so far (see _get_stat)
+        self._stats = {}
+        self.initialPopSize = None  # initial population size (set by calculate_cohort_outcomes)
+
+        if storage == 'array':
+            self.survivalTimes = np.empty(pop_size)
+            self.nTotalPolyps = np.empty(pop_size, dtype=np.int32)
+            self.NTreatments = np.empty(pop_size, dtype=np.int32)
+            self.costs = np.empty(pop_size)
+            self.utilities = np.empty(pop_size)
+            self.lifeYears = np.empty(pop_size)
+            self.costsByRate = np.empty((pop_size, len(self.discountRates)))
+            self.utilitiesByRate = np.empty((pop_size, len(self.discountRates)))
+            if health_states is not None:
+                self.transitionCounts = np.empty((pop_size, len(health_states), len(health_states)), dtype=np.int32)
+                self.residenceTimes = np.empty((pop_size, len(health_states)))
+        elif storage == 'stream':
+            self.survivalTimes = self.nTotalPolyps = self.NTreatments = self.costs = self.utilities = None
+            self.lifeYears = self.costsByRate = self.utilitiesByRate = None
+            self._stats = {
+                'statSurvivalTime': OnlineStat(name='Survival time', bin_width=1),
+                'statNPolyps': OnlineStat(name='Number of polyps', bin_width=1),
+                'statNTreatments': OnlineStat(name='Number of treatments', bin_width=1),
+                'statCost': OnlineStat(name='Discounted cost'),
+                'statUtility': OnlineStat(name='Discounted utility'),
+                'statLifeYears': OnlineStat(name='Life-years'),
+                'statCostsByRate': [OnlineStat(name='Cost discounted at {:.1%}'.format(rate))
+                                    for rate in self.discountRates],
+                'statUtilitiesByRate': [OnlineStat(name='Utility discounted at {:.1%}'.format(rate))
+                                        for rate in self.discountRates]
+            }
+        elif storage != 'list':
+            raise ValueError('Invalid storage of patient outcomes: {}.'.format(storage))
 
     def extract_outcome(self, simulated_patient):
         """ extracts outcomes of a simulated patient
         :param simulated_patient: a simulated patient"""
 
-        # survival time
-        if not (simulated_patient.stateMonitor.survivalTime is None):
-            self.survivalTimes.append(simulated_patient.stateMonitor.survivalTime)
-        # number of strokes
-        self.nTotalPolyps.append(simulated_patient.stateMonitor.nPolyps)
-        self.NTreatments.append(simulated_patient.stateMonitor.nTreatments)
+        state_monitor = simulated_patient.stateMonitor
+        self.record_outcome(survival_time=state_monitor.survivalTime,
+                            n_polyps=state_monitor.nPolyps,
+                            n_treatments=state_monitor.nTreatments,
+                            cost=state_monitor.costUtilityMonitor.totalDiscountedCost,
+                            utility=state_monitor.costUtilityMonitor.totalDiscountedUtility,
+                            costs_by_rate=state_monitor.costUtilityMonitor.totalDiscountedCosts,
+                            utilities_by_rate=state_monitor.costUtilityMonitor.totalDiscountedUtilities,
+                            life_years=state_monitor.costUtilityMonitor.tLastRecorded)
+
+    def record_outcome(self, survival_time, n_polyps, n_treatments, cost, utility,
+                       costs_by_rate, utilities_by_rate, life_years, transition_counts=None, residence_times=None):
+        """ records the outcomes of a simulated patient
+        :param survival_time: survival time (None if the patient is alive at the end of the simulation)
+        :param n_polyps: number of polyps
+        :param n_treatments: number of treatments
+        :param cost: discounted cost
+        :param utility: discounted utility
+        :param costs_by_rate: list of the costs discounted at each of discountRates
+        :param utilities_by_rate: list of the utilities discounted at each of discountRates
+        :param life_years: undiscounted life-years
+        :param transition_counts: number of events from each state to each state (if recorded)
+        :param residence_times: time spent in each state (if recorded)
+        """
+
+        if self.storage == 'list':
+            # survival time
+            if not (survival_time is None):
+                self.survivalTimes.append(survival_time)
+            # number of strokes
+            self.nTotalPolyps.append(n_polyps)
+            self.NTreatments.append(n_treatments)
+
+            self.costs.append(cost)
+            self.utilities.append(utility)
+            self.lifeYears.append(life_years)
+            self.costsByRate.append(costs_by_rate)
+            self.utilitiesByRate.append(utilities_by_rate)
+            if transition_counts is not None:
+                self.transitionCounts.append(transition_counts)
+                self.residenceTimes.append(residence_times)
+
+        elif self.storage == 'array':
+            if not (survival_time is None):
+                self.survivalTimes[self.nDeaths] = survival_time
+            self.nTotalPolyps[self.nPatients] = n_polyps
+            self.NTreatments[self.nPatients] = n_treatments
+            self.costs[self.nPatients] = cost
+            self.utilities[self.nPatients] = utility
+            self.lifeYears[self.nPatients] = life_years
+            self.costsByRate[self.nPatients] = costs_by_rate
+            self.utilitiesByRate[self.nPatients] = utilities_by_rate
+            if transition_counts is not None:
+                self.transitionCounts[self.nPatients] = transition_counts
+                self.residenceTimes[self.nPatients] = residence_times
+
+        else:
+            if not (survival_time is None):
+                self.statSurvivalTime.record(survival_time)
+            self.statNPolyps.record(n_polyps)
+            self.statNTreatments.record(n_treatments)
+            self.statCost.record(cost)
+            self.statUtility.record(utility)
+            self.statLifeYears.record(life_years)
+            for stat, value in zip(self.statCostsByRate, costs_by_rate):
+                stat.record(value)
+            for stat, value in zip(self.statUtilitiesByRate, utilities_by_rate):
+                stat.record(value)
+
+        self.nPatients += 1
+        if not (survival_time is None):
+            self.nDeaths += 1
+
+    def extend(self, other):
+        """ appends the outcomes of patients stored in another CohortOutcomes (with the same storage)
+        :param other: CohortOutcomes of another group of patients
+        """
 
-        self.costs.append(simulated_patient.stateMonitor.costUtilityMonitor.totalDiscountedCost)
-        self.utilities.append(simulated_patient.stateMonitor.costUtilityMonitor.totalDiscountedUtility)
+        if self.storage == 'list':
+            self.survivalTimes.extend(other.survivalTimes)
+            self.nTotalPolyps.extend(other.nTotalPolyps)
+            self.NTreatments.extend(other.NTreatments)
+            self.costs.extend(other.costs)
+            self.utilities.extend(other.utilities)
+            self.lifeYears.extend(other.lifeYears)
+            self.costsByRate.extend(other.costsByRate)
+            self.utilitiesByRate.extend(other.utilitiesByRate)
+            if self.transitionCounts is not None:
+                self.transitionCounts.extend(other.transitionCounts)
+                self.residenceTimes.extend(other.residenceTimes)
+
+        elif self.storage == 'array':
+            deaths = slice(self.nDeaths, self.nDeaths + other.nDeaths)
+            patients = slice(self.nPatients, self.nPatients + other.nPatients)
+            self.survivalTimes[deaths] = other.survivalTimes[:other.nDeaths]
+            self.nTotalPolyps[patients] = other.nTotalPolyps[:other.nPatients]
+            self.NTreatments[patients] = other.NTreatments[:other.nPatients]
+            self.costs[patients] = other.costs[:other.nPatients]
+            self.utilities[patients] = other.utilities[:other.nPatients]
+            self.lifeYears[patients] = other.lifeYears[:other.nPatients]
+            self.costsByRate[patients] = other.costsByRate[:other.nPatients]
+            self.utilitiesByRate[patients] = other.utilitiesByRate[:other.nPatients]
+            if self.transitionCounts is not None:
+                self.transitionCounts[patients] = other.transitionCounts[:other.nPatients]
+                self.residenceTimes[patients] = other.residenceTimes[:other.nPatients]
+
+        else:
+            self.statSurvivalTime.merge(other.statSurvivalTime)
+            self.statNPolyps.merge(other.statNPolyps)
+            self.statNTreatments.merge(other.statNTreatments)
+            self.statCost.merge(other.statCost)
+            self.statUtility.merge(other.statUtility)
+            self.statLifeYears.merge(other.statLifeYears)
+            for stat, other_stat in zip(self.statCostsByRate, other.statCostsByRate):
+                stat.merge(other_stat)
+            for stat, other_stat in zip(self.statUtilitiesByRate, other.statUtilitiesByRate):
+                stat.merge(other_stat)
+
+        self.nPatients += other.nPatients
+        self.nDeaths += other.nDeaths
+
+    def extract_cohort_outcomes(self, survival_times, n_polyps, n_treatments, costs, utilities,
+                                life_years=None, costs_by_rate=None, utilities_by_rate=None,
+                                transition_counts=None, residence_times=None):
+        """ extracts outcomes of a cohort simulated in lockstep (see VectorizedModel)
+        :param survival_times: survival times of patients who died
+        :param n_polyps: number of polyps of each patient
+        :param n_treatments: number of treatments of each patient
+        :param costs: discounted cost of each patient
+        :param utilities: discounted utility of each patient
+        :param life_years: undiscounted life-years of each patient (None if not available,
+            e.g. outcomes saved by an earlier version)
+        :param costs_by_rate: costs of each patient (row) discounted at each of discountRates (column)
+        :param utilities_by_rate: utilities of each patient (row) discounted at each of discountRates (column)
+        :param transition_counts: (patients x states x states) number of events of each patient from each state
+            to each state (if recorded)
+        :param residence_times: (patients x states) time each patient spent in each state (if recorded)
+        """
+
+        if self.storage == 'stream':
+            self.statSurvivalTime.record_array(survival_times)
+            self.statNPolyps.record_array(n_polyps)
+            self.statNTreatments.record_array(n_treatments)
+            self.statCost.record_array(costs)
+            self.statUtility.record_array(utilities)
+            if life_years is not None:
+                self.statLifeYears.record_array(life_years)
+                for k in range(len(self.discountRates)):
+                    self.statCostsByRate[k].record_array(np.asarray(costs_by_rate)[:, k])
+                    self.statUtilitiesByRate[k].record_array(np.asarray(utilities_by_rate)[:, k])
+        else:
+            self.survivalTimes = survival_times
+            self.nTotalPolyps = n_polyps
+            self.NTreatments = n_treatments
+            self.costs = costs
+            self.utilities = utilities
+            self.lifeYears = life_years
+            self.costsByRate = costs_by_rate
+            self.utilitiesByRate = utilities_by_rate
+            if self.healthStates is not None:
+                self.transitionCounts = transition_counts
+                self.residenceTimes = residence_times
+            if self.storage == 'array':
+                self.nTotalPolyps = self.nTotalPolyps.astype(np.int32, copy=False)
+                self.NTreatments = self.NTreatments.astype(np.int32, copy=False)
+
+        self.nPatients = len(costs)
+        self.nDeaths = len(survival_times)
 
     def calculate_cohort_outcomes(self, initial_pop_size):
         """ calculates the cohort outcomes
+        (the summary statistics and the survival curve are calculated when they are first accessed,
+        so callers that only need means and variances do not build them; see get_mean and get_variance)
         :param initial_pop_size: initial population size
         """
-        # summary statistics
-        self.statSurvivalTime = Stat.SummaryStat(name='Survival time', data=self.survivalTimes)
-        self.statNPolyps = Stat.SummaryStat(name='Post-stroke time', data=self.nTotalPolyps)
-        self.statNTreatments = Stat.SummaryStat(name='Post-stroke time', data=self.NTreatments)
-        self.statCost = Stat.SummaryStat(name='Discounted cost', data=self.costs)
-        self.statUtility = Stat.SummaryStat(name='Discounted utility', data=self.utilities)
 
-        # survival curve
-        self.nLivingPatients = Path.PrevalencePathBatchUpdate(
+        self.initialPopSize = initial_pop_size
+
+        if self.storage == 'stream':
+            # the summary statistics are updated as patients are recorded
+            self._stats.pop('nLivingPatients', None)
+            return
+
+        if self.storage == 'array':
+            # only keep the recorded part of the preallocated arrays
+            self.survivalTimes = self.survivalTimes[:self.nDeaths]
+            self.nTotalPolyps = self.nTotalPolyps[:self.nPatients]
+            self.NTreatments = self.NTreatments[:self.nPatients]
+            self.costs = self.costs[:self.nPatients]
+            self.utilities = self.utilities[:self.nPatients]
+            if self.lifeYears is not None:
+                self.lifeYears = self.lifeYears[:self.nPatients]
+                self.costsByRate = self.costsByRate[:self.nPatients]
+                self.utilitiesByRate = self.utilitiesByRate[:self.nPatients]
+            if self.transitionCounts is not None:
+                self.transitionCounts = self.transitionCounts[:self.nPatients]
+                self.residenceTimes = self.residenceTimes[:self.nPatients]
+
+        # transition counts and residence times as (patients x states x states) and (patients x states) arrays
+        if self.transitionCounts is not None:
+            n_states = len(self.healthStates)
+            self.transitionCounts = np.asarray(self.transitionCounts, dtype=np.int32).reshape(
+                (self.nPatients, n_states, n_states))
+            self.residenceTimes = np.asarray(self.residenceTimes, dtype=float).reshape((self.nPatients, n_states))
+
+        if self.lifeYears is not None:
+            # outcomes at the other discount rates as (patients x rates) arrays
+            shape = (self.nPatients, len(self.discountRates))
+            self.costsByRate = np.asarray(self.costsByRate, dtype=float).reshape(shape)
+            self.utilitiesByRate = np.asarray(self.utilitiesByRate, dtype=float).reshape(shape)
+
+        # summary statistics and survival curve of the new outcomes are calculated when accessed
+        self._stats = {}
+
+    def _get_stat(self, name, calculate):
+        """ :returns: a summary statistic (or the survival curve), calculated on its first access
+            after calculate_cohort_outcomes and then reused (None before calculate_cohort_outcomes)
+        :param name: name of the statistic
+        :param calculate: function that calculates the statistic
+        """
+
+        if name not in self._stats:
+            if self.initialPopSize is None:
+                return None
+            self._stats[name] = calculate()
+        return self._stats[name]
+
+    @property
+    def statSurvivalTime(self):
+        """ summary statistics for survival time """
+        return self._get_stat('statSurvivalTime',
+                              lambda: Stat.SummaryStat(name='Survival time', data=self.survivalTimes))
+
+    @property
+    def statNPolyps(self):
+        """ summary statistics for the number of polyps """
+        return self._get_stat('statNPolyps', lambda: Stat.SummaryStat(name='Post-stroke time', data=self.nTotalPolyps))
+
+    @property
+    def statNTreatments(self):
+        """ summary statistics for the number of treatments """
+        return self._get_stat('statNTreatments',
+                              lambda: Stat.SummaryStat(name='Post-stroke time', data=self.NTreatments))
+
+    @property
+    def statCost(self):
+        """ summary statistics for discounted cost """
+        return self._get_stat('statCost', lambda: Stat.SummaryStat(name='Discounted cost', data=self.costs))
+
+    @property
+    def statUtility(self):
+        """ summary statistics for discounted utility """
+        return self._get_stat('statUtility', lambda: Stat.SummaryStat(name='Discounted utility', data=self.utilities))
+
+    @property
+    def statLifeYears(self):
+        """ summary statistics for life-years (None if not recorded) """
+        if self.lifeYears is None and self.storage != 'stream':
+            return None
+        return self._get_stat('statLifeYears', lambda: Stat.SummaryStat(name='Life-years', data=self.lifeYears))
+
+    @property
+    def statCostsByRate(self):
+        """ summary statistics for costs discounted at each of discountRates (None if not recorded) """
+        if self.lifeYears is None and self.storage != 'stream':
+            return None
+        return self._get_stat('statCostsByRate', lambda: [
+            Stat.SummaryStat(name='Cost discounted at {:.1%}'.format(rate), data=self.costsByRate[:, k])
+            for k, rate in enumerate(self.discountRates)])
+
+    @property
+    def statUtilitiesByRate(self):
+        """ summary statistics for utilities discounted at each of discountRates (None if not recorded) """
+        if self.lifeYears is None and self.storage != 'stream':
+            return None
+        return self._get_stat('statUtilitiesByRate', lambda: [
+            Stat.SummaryStat(name='Utility discounted at {:.1%}'.format(rate), data=self.utilitiesByRate[:, k])
+            for k, rate in enumerate(self.discountRates)])
+
+    @property
+    def nLivingPatients(self):
+        """ survival curve (sample path of the number of living patients) """
+        return self._get_stat('nLivingPatients', self._get_survival_curve)
+
+    def _get_survival_curve(self):
+        """ :returns: the sample path of the number of living patients """
+
+        if self.storage == 'stream':
+            # at the resolution of the histogram of survival times
+            bins, counts = self.statSurvivalTime.get_histogram()
+            return Path.PrevalencePathBatchUpdate(
+                name='# of living patients',
+                initial_size=self.initialPopSize,
+                times_of_changes=bins,
+                increments=[-count for count in counts]
+            )
+
+        return Path.PrevalencePathBatchUpdate(
             name='# of living patients',
-            initial_size=initial_pop_size,
+            initial_size=self.initialPopSize,
             times_of_changes=self.survivalTimes,
             increments=[-1]*len(self.survivalTimes)
         )
+
+    def get_mean(self, outcome):
+        """ :returns: the mean of an outcome of the patients (from the observations, without calculating
+            the summary statistics)
+        :param outcome: 'survival_time' (of patients who died), 'n_polyps', 'n_treatments', 'cost', 'utility'
+            or 'life_years'
+        """
+
+        attribute, stat_name = OUTCOME_ATTRIBUTES[outcome]
+        if self.storage == 'stream':
+            return getattr(self, stat_name).get_mean()
+        return float(np.mean(getattr(self, attribute)))
+
+    def get_variance(self, outcome):
+        """ :returns: the sample variance of an outcome of the patients (from the observations, without
+            calculating the summary statistics)
+        :param outcome: 'survival_time' (of patients who died), 'n_polyps', 'n_treatments', 'cost', 'utility'
+            or 'life_years'
+        """
+
+        attribute, stat_name = OUTCOME_ATTRIBUTES[outcome]
+        if self.storage == 'stream':
+            return getattr(self, stat_name).get_variance()
+        values = getattr(self, attribute)
+        return float(np.var(values, ddof=1)) if len(values) > 1 else 0
+
+    def get_rate_index(self, discount_rate):
+        """ :returns: the index of a discount rate in discountRates """
+
+        if discount_rate not in self.discountRates:
+            raise ValueError('Costs and utilities were not recorded at the discount rate {}; '
+                             'set it in the discount rates of the parameters.'.format(discount_rate))
+        return self.discountRates.index(discount_rate)
+
+    def get_costs(self, discount_rate):
+        """ :returns: array of the costs of patients discounted at one of discountRates
+        (after calculate_cohort_outcomes; not available for 'stream' storage)
+        """
+
+        return self.costsByRate[:, self.get_rate_index(discount_rate)]
+
+    def get_utilities(self, discount_rate):
+        """ :returns: array of the utilities of patients discounted at one of discountRates
+        (after calculate_cohort_outcomes; not available for 'stream' storage)
+        """
+
+        return self.utilitiesByRate[:, self.get_rate_index(discount_rate)]
+
+    def get_stat_cost(self, discount_rate):
+        """ :returns: summary statistics of the costs discounted at one of discountRates """
+
+        return self.statCostsByRate[self.get_rate_index(discount_rate)]
+
+    def get_stat_utility(self, discount_rate):
+        """ :returns: summary statistics of the utilities discounted at one of discountRates """
+
+        return self.statUtilitiesByRate[self.get_rate_index(discount_rate)]
+
+    def get_outcome(self, name):
+        """ :returns: array of an outcome of OutcomeRegistry for each patient
+        (after calculate_cohort_outcomes; the transitions of the patients must be recorded)
+        :param name: name of the outcome (see OutcomeRegistry.OUTCOMES)
+        """
+
+        if self.transitionCounts is None:
+            raise ValueError('The transitions of patients were not recorded; '
+                             'create the cohort with if_record_transitions=True.')
+        return OutcomeRegistry.calculate_outcome(name=name,
+                                                 transition_counts=self.transitionCounts,
+                                                 residence_times=self.residenceTimes,
+                                                 health_states=self.healthStates)
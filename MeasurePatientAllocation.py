@@ -0,0 +1,70 @@
+import gc
+import time
+import tracemalloc
+import Strategies as S
+import MarkovModelClasses as Cls
+
+
+# time and memory of simulating a large cohort with Patient objects vs. with PatientSimulator
+STRATEGY_NAME = 'DNA Screen At 45'
+POP_SIZE = 1000000          # patients to time
+TRACED_POP_SIZE = 100000    # patients to trace memory allocations of (tracing slows the simulation)
+
+
+def simulate_with_patient_objects(parameters, sim_length, pop_size):
+    """ simulates patients by creating a Patient (and its monitors) for each patient """
+
+    outcomes = Cls.CohortOutcomes(storage='array', pop_size=pop_size)
+    for i in range(pop_size):
+        patient = Cls.Patient(id=i, parameters=parameters)
+        patient.simulate(sim_length)
+        outcomes.extract_outcome(simulated_patient=patient)
+    return outcomes
+
+
+def simulate_with_simulator(parameters, sim_length, pop_size):
+    """ simulates patients with a single PatientSimulator """
+
+    return Cls.simulate_patients(cohort_id=0, pop_size=pop_size, parameters=parameters, sim_length=sim_length,
+                                 first_index=0, last_index=pop_size, storage='array')
+
+
+def measure(function, parameters, sim_length):
+    """ prints the time, the number of garbage collections and the peak traced memory of a simulation """
+
+    # time and number of garbage collections
+    gc.collect()
+    n_collections = sum(stat['collections'] for stat in gc.get_stats())
+    start = time.perf_counter()
+    outcomes = function(parameters=parameters, sim_length=sim_length, pop_size=POP_SIZE)
+    elapsed = time.perf_counter() - start
+    n_collections = sum(stat['collections'] for stat in gc.get_stats()) - n_collections
+
+    # peak memory allocated while simulating (excluding the preallocated outcome arrays)
+    tracemalloc.start()
+    function(parameters=parameters, sim_length=sim_length, pop_size=TRACED_POP_SIZE)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    outcome_size = 0
+    for array in (outcomes.survivalTimes, outcomes.nTotalPolyps, outcomes.NTreatments,
+                  outcomes.costs, outcomes.utilities):
+        outcome_size += array.nbytes * TRACED_POP_SIZE // POP_SIZE
+
+    print('  Time: {:.1f} seconds ({:.1f} microseconds per patient)'.format(elapsed, 1e6 * elapsed / POP_SIZE))
+    print('  Garbage collections: {:,}'.format(n_collections))
+    print('  Peak memory allocated while simulating {:,} patients: {:.2f} MB (outcome arrays: {:.2f} MB)'.format(
+        TRACED_POP_SIZE, peak / 2 ** 20, outcome_size / 2 ** 20))
+    return outcomes
+
+
+if __name__ == '__main__':
+    parameters = S.get_parameters(name=STRATEGY_NAME)
+    sim_length = S.STRATEGIES[STRATEGY_NAME].simLength
+
+    print('{:,} patients simulated with Patient objects:'.format(POP_SIZE))
+    outcomes_objects = measure(simulate_with_patient_objects, parameters, sim_length)
+    print('{:,} patients simulated with PatientSimulator:'.format(POP_SIZE))
+    outcomes_simulator = measure(simulate_with_simulator, parameters, sim_length)
+
+    print('Identical outcomes:', (outcomes_objects.costs == outcomes_simulator.costs).all()
+          and (outcomes_objects.utilities == outcomes_simulator.utilities).all())
@@ -0,0 +1,228 @@
+import numpy as np
+
+
+class TransitionTables:
+    def __init__(self, trans_rate_matrix, if_self_transitions=False):
+        """ tables of exit rates, jump probabilities and absorbing states of a continuous-time
+        Markov model (built once and shared by all patients)
+        :param trans_rate_matrix: transition rate matrix
+        :param if_self_transitions: set to True if the diagonal of the matrix holds the rates of
+            re-entering the same state (otherwise the diagonal is ignored)
+        """
+
+        rates = np.array(trans_rate_matrix, dtype=float)
+        if not if_self_transitions:
+            np.fill_diagonal(rates, 0)
+        self.nStates = len(rates)
+
+        # total rate out of each state and the absorbing states (no rate out)
+        self.exitRates = rates.sum(axis=1)
+        self.ifAbsorbing = self.exitRates <= 0
+
+        # mean time spent in each state (None for absorbing states)
+        self.meanSojournTimes = [None if a else 1 / rate for a, rate in zip(self.ifAbsorbing, self.exitRates)]
+
+        # cumulative probabilities of the next state given the current state
+        # (rows of absorbing states are left as 0)
+        self.cumJumpProbs = np.zeros((self.nStates, self.nStates))
+        for i in range(self.nStates):
+            if not self.ifAbsorbing[i]:
+                cdf = np.cumsum(rates[i] / self.exitRates[i])
+                self.cumJumpProbs[i] = cdf / cdf[-1]
+
+    def get_next_state(self, current_state_index, rng):
+        """ samples the time until the next event and the next state
+        (the same draws as the Gillespie algorithm: an exponential time and one uniform number)
+        :param current_state_index: index of the current state
+        :param rng: random number generator
+        :returns: (dt, index of the next state); dt is None if the current state is absorbing
+        """
+
+        mean_sojourn_time = self.meanSojournTimes[current_state_index]
+        if mean_sojourn_time is None:
+            return None, current_state_index
+
+        dt = rng.exponential(scale=mean_sojourn_time)
+        i = self.cumJumpProbs[current_state_index].searchsorted(rng.random_sample(), side='right')
+        return dt, int(i)
+
+
+class StateTables:
+    def __init__(self, health_states):
+        """ lookup lists (indexed by health state) of the kinds of health states, so that
+        patients are simulated on integer state codes instead of HealthStates members
+        (states that are not in health_states are skipped)
+        :param health_states: HealthStates enum of the model
+        """
+
+        n_states = len(health_states)
+        self.ifDeath = self._get_flags(health_states, n_states, ('CRC_DEATH', 'NATURAL_DEATH'))
+        self.ifPolyp = self._get_flags(health_states, n_states, ('SMALL', 'LARGE'))
+        self.ifTreatment = self._get_flags(health_states, n_states, ('TREATMENT',))
+        self.ifScreen = self._get_flags(health_states, n_states, ('SCREEN_NO_DISEASE', 'SCREEN_DISEASE'))
+
+    @staticmethod
+    def _get_flags(health_states, n_states, names):
+        """ :returns: a list that is True for the states with the given names """
+
+        flags = [False] * n_states
+        for name in names:
+            if name in health_states.__members__:
+                flags[health_states[name].value] = True
+        return flags
+
+    @staticmethod
+    def get_indices(flags):
+        """ :returns: the indices of the states that are True in the list of flags """
+
+        return [i for i, flag in enumerate(flags) if flag]
+
+
+class CostUtilityTables:
+    def __init__(self, annual_state_costs, annual_state_utilities, one_time_state_costs,
+                 annual_treatment_cost, screen_state_indices, discount_rate, discount_rates=()):
+        """ per-state costs and utilities used to accumulate the discounted cost and utility
+        of patients (built once and shared by all patients)
+        :param annual_state_costs: annual cost of each health state
+        :param annual_state_utilities: annual utility of each health state
+        :param one_time_state_costs: one-time cost of entering each health state
+        :param annual_treatment_cost: annual cost of screening (added to the screening states)
+        :param screen_state_indices: indices of the screening states
+        :param discount_rate: annual discount rate (continuously compounded)
+        :param discount_rates: other annual discount rates at which costs and utilities are also accumulated
+            (e.g. [0, 0.03, 0.05] to report outcomes at each of these rates)
+        """
+
+        # annual cost of each state (including the annual cost of screening)
+        self.annualCosts = np.array(annual_state_costs, dtype=float)
+        for i in screen_state_indices:
+            self.annualCosts[i] += annual_treatment_cost
+
+        self.annualUtilities = np.array(annual_state_utilities, dtype=float)
+        self.oneTimeCosts = np.array(one_time_state_costs, dtype=float)
+        self.discountRate = discount_rate
+        self.discountRates = [float(r) for r in discount_rates]
+
+        # all discount rates (the discount rate first, then discountRates)
+        self.rates = DiscountRates(rates=[discount_rate] + self.discountRates)
+
+    def get_accruals(self, t_last, t, from_states, to_states):
+        """ :returns: (discounted costs, discounted utilities) accrued over intervals from t_last to t spent in
+            from_states and ending with an entry into to_states (the annual cost and utility of the state over
+            the interval and the one-time cost of entering the next state) at each discount rate (the discount
+            rate first, then discountRates); arrays with a row per interval and a column per rate
+            (or with an element per rate for a single interval)
+        (the accrual shared by all engines: Patient objects, the per-patient engines through
+        Trajectories.CohortTrajectories and VectorizedModel)
+        :param t_last: start of each interval (time of the previous event)
+        :param t: end of each interval (time of the event)
+        :param from_states: index of the state during each interval
+        :param to_states: index of the state entered at the end of each interval
+        """
+
+        discount_factors, pv_factors = self.rates.get_discount_factors(t_last=t_last, t=t)
+        costs = self.annualCosts[from_states][..., np.newaxis] * pv_factors \
+            + self.oneTimeCosts[to_states][..., np.newaxis] * discount_factors
+        utilities = self.annualUtilities[from_states][..., np.newaxis] * pv_factors
+        return costs, utilities
+
+
+class DiscountRates:
+    def __init__(self, rates):
+        """ annual discount rates (continuously compounded) with the rates that are not 0 and their inverses
+        (0 for rates that are 0), so that payments are discounted at every rate at once
+        :param rates: list of annual discount rates
+        """
+
+        self.rates = np.array(rates, dtype=float)
+        self.ifDiscounted = self.rates > 0
+        self.inverseRates = np.zeros(len(self.rates))
+        self.inverseRates[self.ifDiscounted] = 1 / self.rates[self.ifDiscounted]
+        self.ifUndiscounted = (~self.ifDiscounted).astype(float)
+
+    def __len__(self):
+        return len(self.rates)
+
+    def get_discount_factors(self, t_last, t):
+        """ :returns: (discount factors at t, present values of a continuous payment of 1 per unit of time
+            from t_last to t (the time from t_last to t for rates that are 0)) at each rate; arrays with
+            a row per time and a column per rate (or with an element per rate if t is a number)
+        :param t_last: start of each period
+        :param t: end of each period
+        """
+
+        t_last = np.asarray(t_last, dtype=float)[..., np.newaxis]
+        t = np.asarray(t, dtype=float)[..., np.newaxis]
+        discount_factors = np.exp(-t * self.rates)
+        pv_factors = (np.exp(-t_last * self.rates) - discount_factors) * self.inverseRates \
+            + (t - t_last) * self.ifUndiscounted
+        return discount_factors, pv_factors
+
+
+def collapse_fast_states(trans_rate_matrix, cost_utility_tables, fast_state_indices, recorded_state_indices):
+    """ builds the tables of a model in which visits to fast transient states (e.g. the screening
+    states, which patients leave within days) are instantaneous: a jump into a fast state is
+    replaced by a jump to the state where the excursion ends, and the expected cost and utility
+    accrued during the excursion are added to the annual cost and utility of the state it starts from
+    :param trans_rate_matrix: transition rate matrix
+    :param cost_utility_tables: CostUtilityTables of the model
+    :param fast_state_indices: indices of the fast transient states
+    :param recorded_state_indices: indices of states whose entries are counted as outcomes;
+        an excursion that returns to the state it started from is kept as a re-entry into that
+        state if the state is recorded or has a one-time cost, and dropped otherwise
+    :returns: (TransitionTables, CostUtilityTables) of the collapsed model
+    """
+
+    rates = np.array(trans_rate_matrix, dtype=float)
+    np.fill_diagonal(rates, 0)
+    n_states = len(rates)
+    exit_rates = rates.sum(axis=1)
+
+    fast = np.zeros(n_states, dtype=bool)
+    fast[fast_state_indices] = True
+    if np.any(exit_rates[fast] <= 0):
+        raise ValueError('Fast transient states cannot be absorbing.')
+
+    annual_costs = np.array(cost_utility_tables.annualCosts)
+    annual_utilities = np.array(cost_utility_tables.annualUtilities)
+    one_time_costs = np.array(cost_utility_tables.oneTimeCosts)
+
+    # jump probabilities out of fast states
+    jump_probs = rates[fast] / exit_rates[fast][:, np.newaxis]
+    # expected number of visits to each fast state during an excursion starting in a fast state
+    n_visits = np.linalg.inv(np.eye(fast.sum()) - jump_probs[:, fast])
+    # probability that an excursion starting in a fast state ends in each of the other states
+    exit_probs = n_visits @ jump_probs[:, ~fast]
+
+    # expected duration, cost and utility of an excursion starting in a fast state
+    mean_sojourn_times = 1 / exit_rates[fast]
+    durations = n_visits @ mean_sojourn_times
+    costs = n_visits @ (annual_costs[fast] * mean_sojourn_times + one_time_costs[fast])
+    utilities = n_visits @ (annual_utilities[fast] * mean_sojourn_times)
+
+    # rates of the collapsed model
+    collapsed_rates = rates.copy()
+    collapsed_rates[np.ix_(~fast, ~fast)] += rates[np.ix_(~fast, fast)] @ exit_probs
+    collapsed_rates[np.ix_(~fast, fast)] = 0
+
+    # excursions that return to a state without recorded outcomes are dropped
+    if_recorded = one_time_costs > 0
+    if_recorded[recorded_state_indices] = True
+    np.fill_diagonal(collapsed_rates, np.where(if_recorded, np.diag(collapsed_rates), 0))
+
+    # the time spent in excursions is replaced by their expected cost and utility
+    excursion_rates = rates[~fast][:, fast]
+    collapsed_costs = annual_costs.copy()
+    collapsed_utilities = annual_utilities.copy()
+    collapsed_costs[~fast] += excursion_rates @ costs - excursion_rates @ durations * annual_costs[~fast]
+    collapsed_utilities[~fast] += excursion_rates @ utilities - excursion_rates @ durations * annual_utilities[~fast]
+
+    trans_tables = TransitionTables(trans_rate_matrix=collapsed_rates, if_self_transitions=True)
+    cost_utility_tables = CostUtilityTables(annual_state_costs=collapsed_costs,
+                                            annual_state_utilities=collapsed_utilities,
+                                            one_time_state_costs=one_time_costs,
+                                            annual_treatment_cost=0,
+                                            screen_state_indices=[],
+                                            discount_rate=cost_utility_tables.discountRate,
+                                            discount_rates=cost_utility_tables.discountRates)
+    return trans_tables, cost_utility_tables
@@ -0,0 +1,138 @@
+import json
+import os
+from enum import Enum
+import numpy as np
+import MarkovModelClasses as Cls
+import EventLog
+
+
+# columns of the outcome files: (file name, attribute of CohortOutcomes, data type)
+COLUMNS = [
+    ('survival_times', 'survivalTimes', np.float64),
+    ('n_polyps', 'nTotalPolyps', np.int32),
+    ('n_treatments', 'NTreatments', np.int32),
+    ('costs', 'costs', np.float64),
+    ('utilities', 'utilities', np.float64)
+]
+# columns that are saved only if the CohortOutcomes has them (e.g. the transitions of patients are recorded)
+OPTIONAL_COLUMNS = [
+    ('life_years', 'lifeYears', np.float64),
+    ('costs_by_rate', 'costsByRate', np.float64),
+    ('utilities_by_rate', 'utilitiesByRate', np.float64),
+    ('transition_counts', 'transitionCounts', np.int32),
+    ('residence_times', 'residenceTimes', np.float64)
+]
+
+
+def save_cohort_outcomes(cohort_outcomes, path, initial_pop_size, if_compressed=False):
+    """ saves the per-patient outcomes of a cohort in a binary columnar format
+    (also the life-years, the outcomes at the other discount rates and the transition counts and
+    residence times of the patients if the CohortOutcomes has them)
+    :param cohort_outcomes: CohortOutcomes with the observations of patients ('list' or 'array' storage)
+    :param path: a directory with one .npy file per outcome (that can be memory-mapped when loaded)
+        or, if if_compressed is True, a compressed .npz file
+    :param initial_pop_size: initial population size of the cohort (to rebuild the survival curve)
+    :param if_compressed: set to True to save a compressed .npz file (smaller, but has to be decompressed
+        into memory when loaded)
+    """
+
+    if cohort_outcomes.storage == 'stream':
+        raise ValueError('Outcomes stored as \'stream\' have no per-patient observations to save.')
+
+    columns = {file_name: np.asarray(getattr(cohort_outcomes, attribute), dtype=data_type)
+               for file_name, attribute, data_type in COLUMNS}
+    for file_name, attribute, data_type in OPTIONAL_COLUMNS:
+        if getattr(cohort_outcomes, attribute) is not None:
+            columns[file_name] = np.asarray(getattr(cohort_outcomes, attribute), dtype=data_type)
+
+    # discount rates of the costs and utilities by rate and names of the health states of the transitions
+    discount_rates = list(cohort_outcomes.discountRates)
+    health_state_names = [] if cohort_outcomes.healthStates is None \
+        else [state.name for state in cohort_outcomes.healthStates]
+
+    if if_compressed:
+        np.savez_compressed(path, initial_pop_size=initial_pop_size,
+                            discount_rates=np.array(discount_rates, dtype=np.float64),
+                            health_state_names=np.array(health_state_names, dtype=str),
+                            **columns)
+    else:
+        os.makedirs(path, exist_ok=True)
+        for file_name, column in columns.items():
+            np.save(os.path.join(path, file_name + '.npy'), column)
+        with open(os.path.join(path, 'metadata.json'), 'w') as file:
+            json.dump({'initial_pop_size': initial_pop_size,
+                       'n_patients': len(columns['costs']),
+                       'n_deaths': len(columns['survival_times']),
+                       'discount_rates': discount_rates,
+                       'health_state_names': health_state_names}, file)
+
+
+def load_cohort_outcomes(path, mmap_mode='r', if_calculate_stats=True, health_states=None):
+    """ loads the per-patient outcomes of a cohort saved by save_cohort_outcomes
+    :param path: directory or .npz file of the saved outcomes
+    :param mmap_mode: memory-map mode of the .npy files ('r' to read outcomes from the disk only when they
+        are accessed, None to read them into memory); not used for .npz files
+    :param if_calculate_stats: set to False to skip calculating the summary statistics and the survival curve
+        (so only the per-patient outcomes are available)
+    :param health_states: HealthStates of the model the saved transitions of patients are indexed by
+        (if None, an Enum with the saved names of the health states is used)
+    :returns: CohortOutcomes with 'array' storage
+    """
+
+    if os.path.isdir(path):
+        # (np.asarray keeps a memory-mapped column mapped but makes it a plain ndarray)
+        columns = {file_name: np.asarray(np.load(os.path.join(path, file_name + '.npy'), mmap_mode=mmap_mode))
+                   for file_name, _, _ in COLUMNS + OPTIONAL_COLUMNS
+                   if os.path.exists(os.path.join(path, file_name + '.npy'))}
+        with open(os.path.join(path, 'metadata.json')) as file:
+            metadata = json.load(file)
+        initial_pop_size = metadata['initial_pop_size']
+        discount_rates = metadata.get('discount_rates', [])
+        health_state_names = metadata.get('health_state_names', [])
+    else:
+        with np.load(path) as data:
+            columns = {file_name: data[file_name] for file_name, _, _ in COLUMNS + OPTIONAL_COLUMNS
+                       if file_name in data.files}
+            initial_pop_size = int(data['initial_pop_size'])
+            discount_rates = data['discount_rates'].tolist() if 'discount_rates' in data.files else []
+            health_state_names = data['health_state_names'].tolist() if 'health_state_names' in data.files else []
+
+    if 'transition_counts' in columns and health_states is None:
+        health_states = Enum('HealthStates', [(name, i) for i, name in enumerate(health_state_names)])
+
+    cohort_outcomes = Cls.CohortOutcomes(storage='array', pop_size=0, discount_rates=discount_rates,
+                                         health_states=health_states if 'transition_counts' in columns else None)
+    cohort_outcomes.extract_cohort_outcomes(**columns)
+    if if_calculate_stats:
+        cohort_outcomes.calculate_cohort_outcomes(initial_pop_size=initial_pop_size)
+
+    return cohort_outcomes
+
+
+def save_trajectories(events, path, if_compressed=False):
+    """ saves the events of patients in the format of save_cohort_outcomes
+    :param events: dictionary of the arrays of events (see EventLog.get_events)
+    :param path: a directory with one .npy file per column or, if if_compressed is True, a compressed .npz file
+    :param if_compressed: set to True to save a compressed .npz file
+    """
+
+    if if_compressed:
+        np.savez_compressed(path, **{name: events[name] for name, _, _ in EventLog.COLUMNS})
+    else:
+        os.makedirs(path, exist_ok=True)
+        for name, _, data_type in EventLog.COLUMNS:
+            np.save(os.path.join(path, name + '.npy'), np.asarray(events[name], dtype=data_type))
+
+
+def load_trajectories(path, mmap_mode='r'):
+    """ :returns: dictionary of the arrays of events saved by save_trajectories
+        (e.g. to re-calculate outcomes with Trajectories.CohortTrajectories)
+    :param path: directory or .npz file of the saved events
+    :param mmap_mode: memory-map mode of the .npy files (see load_cohort_outcomes)
+    """
+
+    if os.path.isdir(path):
+        return {name: np.asarray(np.load(os.path.join(path, name + '.npy'), mmap_mode=mmap_mode))
+                for name, _, _ in EventLog.COLUMNS}
+    with np.load(path) as data:
+        return {name: data[name] for name, _, _ in EventLog.COLUMNS}
@@ -0,0 +1,111 @@
+import numpy as np
+
+
+class OutcomeSpec:
+    def __init__(self, name, calculate):
+        """ an outcome of patients derived from their transition counts and residence times
+        :param name: name of the outcome
+        :param calculate: function(transition_counts, residence_times, health_states) that returns an array
+            of the outcome of each patient from the (patients x states x states) transition counts and the
+            (patients x states) residence times of the patients (see CohortOutcomes.get_outcome)
+        """
+
+        self.name = name
+        self.calculate = calculate
+
+
+def get_state_indices(health_states, names):
+    """ :returns: the indices of the health states with the given names (states that are not in health_states
+    are skipped, so that an outcome can be calculated for models without some of the states)
+    """
+
+    return [health_states[name].value for name in names if name in health_states.__members__]
+
+
+def get_entries(names, if_count_stays=True):
+    """ :returns: a function that calculates the number of events of each patient into the states
+    :param names: names of the states
+    :param if_count_stays: set to False to not count events from these states into these states
+        (e.g. staying in the current state at the end of the simulation, which the engines record as an
+        event into the current state, or a screening visit that returns to the same state)
+    """
+
+    def calculate(transition_counts, residence_times, health_states):
+        indices = get_state_indices(health_states, names)
+        entries = transition_counts[:, :, indices].sum(axis=(1, 2))
+        if not if_count_stays:
+            entries -= transition_counts[:, indices][:, :, indices].sum(axis=(1, 2))
+        return entries
+    return calculate
+
+
+def get_time_in(names):
+    """ :returns: a function that calculates the time each patient spent in the states
+    :param names: names of the states
+    """
+
+    def calculate(transition_counts, residence_times, health_states):
+        return residence_times[:, get_state_indices(health_states, names)].sum(axis=1)
+    return calculate
+
+
+def get_if_entered(names):
+    """ :returns: a function that is 1 for the patients who entered the states (from other states) and 0 otherwise
+    :param names: names of the states
+    """
+
+    count_entries = get_entries(names=names, if_count_stays=False)
+
+    def calculate(transition_counts, residence_times, health_states):
+        return (count_entries(transition_counts, residence_times, health_states) > 0).astype(np.int64)
+    return calculate
+
+
+def get_life_years(transition_counts, residence_times, health_states):
+    """ :returns: the time each patient was alive (the death states are absorbing, so patients
+    spend no time in them) """
+
+    return residence_times.sum(axis=1)
+
+
+# registry of outcomes
+OUTCOMES = {spec.name: spec for spec in [
+    # as counted by PatientStateMonitor (including staying in the state at the end of the simulation)
+    OutcomeSpec(name='nPolyps', calculate=get_entries(names=['SMALL', 'LARGE'])),
+    OutcomeSpec(name='nTreatments', calculate=get_entries(names=['TREATMENT'])),
+    # screening visits
+    OutcomeSpec(name='nScreens', calculate=get_entries(names=['SCREEN_NO_DISEASE', 'SCREEN_DISEASE'],
+                                                       if_count_stays=False)),
+    OutcomeSpec(name='nScreenDiseaseVisits', calculate=get_entries(names=['SCREEN_DISEASE'], if_count_stays=False)),
+    # CRC incidence (1 for patients who developed CRC)
+    OutcomeSpec(name='ifCRC', calculate=get_if_entered(names=['CRC', 'CRC_DEATH'])),
+    OutcomeSpec(name='nCRCDeaths', calculate=get_entries(names=['CRC_DEATH'])),
+    # time in states
+    OutcomeSpec(name='timeWithPolyps', calculate=get_time_in(names=['SMALL', 'LARGE'])),
+    OutcomeSpec(name='timeWithCRC', calculate=get_time_in(names=['CRC'])),
+    OutcomeSpec(name='lifeYears', calculate=get_life_years),
+]}
+
+
+def register_outcome(name, calculate):
+    """ adds an outcome to the registry (see OutcomeSpec)
+    :param name: name of the outcome
+    :param calculate: function(transition_counts, residence_times, health_states) that returns an array
+        of the outcome of each patient
+    """
+
+    OUTCOMES[name] = OutcomeSpec(name=name, calculate=calculate)
+
+
+def calculate_outcome(name, transition_counts, residence_times, health_states):
+    """ :returns: array of a registered outcome of each patient
+    :param name: name of the outcome
+    :param transition_counts: (patients x states x states) number of events of each patient from each state
+        to each state
+    :param residence_times: (patients x states) time each patient spent in each state
+    :param health_states: HealthStates of the model
+    """
+
+    if name not in OUTCOMES:
+        raise ValueError('Unknown outcome: {}.'.format(name))
+    return OUTCOMES[name].calculate(transition_counts, residence_times, health_states)
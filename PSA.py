@@ -0,0 +1,128 @@
+import copy
+import csv
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+import SimPy.RandomVariantGenerators as RVGs
+
+
+def get_gamma_rvg(mean, st_dev):
+    """ :returns: a gamma random variate generator with the given mean and standard deviation """
+
+    return RVGs.Gamma(a=(mean / st_dev) ** 2, loc=0, scale=st_dev ** 2 / mean)
+
+
+def get_beta_rvg(mean, st_dev):
+    """ :returns: a beta random variate generator with the given mean and standard deviation """
+
+    n = mean * (1 - mean) / st_dev ** 2 - 1
+    return RVGs.Beta(a=mean * n, b=(1 - mean) * n)
+
+
+class PSAParameter:
+    def __init__(self, name, rvg, update):
+        """ a parameter whose value is sampled in probabilistic sensitivity analysis
+        :param name: name of the parameter (a column of the results file)
+        :param rvg: random variate generator of the parameter (see SimPy.RandomVariantGenerators)
+        :param update: function(parameters, value) that sets a sampled value in a Parameters object
+        """
+
+        self.name = name
+        self.rvg = rvg
+        self.update = update
+
+
+class ParameterGenerator:
+    def __init__(self, base_parameters, psa_parameters):
+        """ samples parameter sets for probabilistic sensitivity analysis
+        :param base_parameters: list of Parameters objects (one per strategy)
+        :param psa_parameters: list of PSAParameter objects
+        """
+
+        self.baseParameters = base_parameters
+        self.psaParameters = psa_parameters
+
+    def get_new_parameters(self, seed):
+        """ samples a value of each PSA parameter and applies it to a copy of each strategy's
+        parameters (the parameters and the InputData modules are not modified)
+        :param seed: seed of the random number generator
+        :returns: (list of sampled values, list of Parameters objects (one per strategy))
+        """
+
+        rng = np.random.RandomState(seed=seed)
+        values = [psa_param.rvg.sample(rng) for psa_param in self.psaParameters]
+
+        parameter_sets = []
+        for base in self.baseParameters:
+            parameters = copy.deepcopy(base)
+            for psa_param, value in zip(self.psaParameters, values):
+                psa_param.update(parameters, value)
+            parameters.build_tables()
+            parameter_sets.append(parameters)
+
+        return values, parameter_sets
+
+
+def simulate_draw(cohort_class, draw, parameter_sets, pop_size, sim_length, if_vectorized):
+    """ simulates a cohort of each strategy for one parameter draw
+    (defined at the module level so that draws can be simulated by a process pool)
+    :param cohort_class: Cohort class of the model
+    :param draw: index of the parameter draw (used as the cohort id of every strategy)
+    :param parameter_sets: list of Parameters objects (one per strategy)
+    :param pop_size: population size of each cohort
+    :param sim_length: simulation length
+    :param if_vectorized: set to True to simulate cohorts with the vectorized engine
+    :returns: list of the mean discounted cost and utility of each strategy
+    """
+
+    means = []
+    for parameters in parameter_sets:
+        cohort = cohort_class(id=draw, pop_size=pop_size, parameters=parameters)
+        cohort.simulate(sim_length=sim_length, if_vectorized=if_vectorized)
+        means.append(cohort.cohortOutcomes.get_mean(outcome='cost'))
+        means.append(cohort.cohortOutcomes.get_mean(outcome='utility'))
+    return means
+
+
+def run_psa(cohort_class, strategy_names, base_parameters, psa_parameters,
+            n_draws, pop_size, sim_length, file_name, n_processes=1, if_vectorized=True):
+    """ runs probabilistic sensitivity analysis: for each parameter draw, a cohort of each strategy is
+    simulated and the mean discounted cost and utility of each strategy are written to a csv file
+    as soon as the draw is simulated
+    :param cohort_class: Cohort class of the model
+    :param strategy_names: names of strategies
+    :param base_parameters: list of Parameters objects (one per strategy)
+    :param psa_parameters: list of PSAParameter objects
+    :param n_draws: number of parameter draws
+    :param pop_size: population size of each cohort
+    :param sim_length: simulation length
+    :param file_name: name of the csv file to write the results to
+    :param n_processes: number of processes to simulate the draws in parallel
+    :param if_vectorized: set to True to simulate cohorts with the vectorized engine
+    """
+
+    generator = ParameterGenerator(base_parameters=base_parameters, psa_parameters=psa_parameters)
+
+    # header of the results file
+    header = ['Draw'] + [psa_param.name for psa_param in psa_parameters]
+    for name in strategy_names:
+        header += [name + ' cost', name + ' utility']
+
+    with open(file_name, 'w', newline='') as file, ProcessPoolExecutor(max_workers=n_processes) as executor:
+        writer = csv.writer(file)
+        writer.writerow(header)
+
+        # sample the parameters of all draws (the draw index is the seed)
+        values, parameter_sets = zip(*[generator.get_new_parameters(seed=draw) for draw in range(n_draws)])
+
+        # simulate the draws in parallel and write the results in the order of draws
+        results = executor.map(simulate_draw,
+                               [cohort_class] * n_draws,
+                               range(n_draws),
+                               parameter_sets,
+                               [pop_size] * n_draws,
+                               [sim_length] * n_draws,
+                               [if_vectorized] * n_draws)
+        for draw, means in enumerate(results):
+            writer.writerow([draw] + list(values[draw]) + means)
+            file.flush()
@@ -0,0 +1,80 @@
+import InputDataDNA as D
+import Strategies as S
+import MarkovModelClasses as Cls
+import PSA
+
+
+N_DRAWS = 5000      # number of parameter draws
+N_PROCESSES = 8     # number of processes to simulate the draws in parallel
+STRATEGY_NAMES = ['DNA Screen At 45', 'DNA Screen At 50']  # strategies to compare
+
+WELL = D.HealthStates.WELL.value
+NATURAL_DEATH = D.HealthStates.NATURAL_DEATH.value
+
+
+def update_screening_cost(parameters, value):
+    parameters.annualTreatmentCost = value
+
+
+def update_excess_mortality(parameters, value):
+    # mortality of the screening and treatment states relative to the mortality in WELL
+    for state in (D.HealthStates.SCREEN_NO_DISEASE, D.HealthStates.SCREEN_DISEASE, D.HealthStates.TREATMENT):
+        parameters.transRateMatrix[state.value][NATURAL_DEATH] = \
+            parameters.transRateMatrix[WELL][NATURAL_DEATH] * (1 + value)
+
+
+def update_one_time_cost(states):
+    def update(parameters, value):
+        for state in states:
+            parameters.oneTimeStateCosts[state.value] = value
+    return update
+
+
+def update_annual_cost(state):
+    def update(parameters, value):
+        parameters.annualStateCosts[state.value] = value
+    return update
+
+
+def update_utility(state):
+    def update(parameters, value):
+        parameters.annualStateUtilities[state.value] = value
+    return update
+
+
+# distributions of parameters (mean = the value in InputDataDNA)
+PSA_PARAMETERS = [
+    PSA.PSAParameter(name='DNA cost', rvg=PSA.get_gamma_rvg(mean=D.DNA_COST, st_dev=D.DNA_COST * 0.1),
+                     update=update_screening_cost),
+    PSA.PSAParameter(name='Excess mortality', rvg=PSA.get_gamma_rvg(mean=D.r1 - 1, st_dev=0.01),
+                     update=update_excess_mortality),
+    PSA.PSAParameter(name='Polypectomy cost', rvg=PSA.get_gamma_rvg(mean=1823, st_dev=182.3),
+                     update=update_one_time_cost([D.HealthStates.SMALL, D.HealthStates.LARGE])),
+    PSA.PSAParameter(name='CRC diagnosis cost', rvg=PSA.get_gamma_rvg(mean=64986, st_dev=6498.6),
+                     update=update_one_time_cost([D.HealthStates.CRC])),
+    PSA.PSAParameter(name='Treatment cost', rvg=PSA.get_gamma_rvg(mean=1278, st_dev=127.8),
+                     update=update_one_time_cost([D.HealthStates.TREATMENT])),
+    PSA.PSAParameter(name='Annual CRC cost', rvg=PSA.get_gamma_rvg(mean=4497, st_dev=449.7),
+                     update=update_annual_cost(D.HealthStates.CRC)),
+    PSA.PSAParameter(name='Utility of small polyp', rvg=PSA.get_beta_rvg(mean=0.9, st_dev=0.03),
+                     update=update_utility(D.HealthStates.SMALL)),
+    PSA.PSAParameter(name='Utility of large polyp', rvg=PSA.get_beta_rvg(mean=0.85, st_dev=0.03),
+                     update=update_utility(D.HealthStates.LARGE)),
+    PSA.PSAParameter(name='Utility of CRC', rvg=PSA.get_beta_rvg(mean=0.7, st_dev=0.05),
+                     update=update_utility(D.HealthStates.CRC)),
+    PSA.PSAParameter(name='Utility of treatment', rvg=PSA.get_beta_rvg(mean=0.82, st_dev=0.05),
+                     update=update_utility(D.HealthStates.TREATMENT)),
+]
+
+
+if __name__ == '__main__':
+    # probabilistic sensitivity analysis of screening at 45 vs. screening at 50
+    PSA.run_psa(cohort_class=Cls.Cohort,
+                strategy_names=STRATEGY_NAMES,
+                base_parameters=[S.get_parameters(name=name) for name in STRATEGY_NAMES],
+                psa_parameters=PSA_PARAMETERS,
+                n_draws=N_DRAWS,
+                pop_size=D.POP_SIZE,
+                sim_length=S.STRATEGIES[STRATEGY_NAMES[0]].simLength,
+                file_name='PSAResults.csv',
+                n_processes=N_PROCESSES)
@@ -1,43 +1,71 @@
-from enum import Enum
-import InputData45Screen as Data
+import ModelTables
 
 
-class Therapies(Enum):
-    """ mono vs. combination therapy """
-    NoScreen = 0
-    Screen = 1
+class Parameters:
+    def __init__(self, strategy, if_collapse_screen_visits=False, discount_rates=()):
+        """
+        :param strategy: specification of the selected strategy (see Strategies.StrategySpec)
+        :param if_collapse_screen_visits: set to True to treat visits to the screening states
+            (which patients leave within days) as instantaneous (see ModelTables.collapse_fast_states)
+        :param discount_rates: other discount rates at which costs and utilities are also accumulated
+            in the same simulation (e.g. [0, 0.03, 0.05]; see CohortOutcomes.get_costs)
+        """
 
+        # selected strategy
+        self.strategy = strategy
 
-class Parameters:
-    def __init__(self, therapy):
+        # health states and initial health state
+        self.healthStates = strategy.healthStates
+        self.initialHealthState = strategy.healthStates.WELL
+        # kinds of health states (death, polyp, treatment, screening) indexed by state
+        self.stateTables = ModelTables.StateTables(health_states=strategy.healthStates)
+
+        # annual cost of screening (charged in the screening states)
+        self.annualTreatmentCost = strategy.annualScreeningCost
+
+        # transition rate matrix of the selected strategy
+        self.transRateMatrix = strategy.transRateMatrix
 
-        # selected therapy
-        self.therapy = therapy  # anticoagulation or no anticoagulation for clinical trial
+        # annual state costs and utilities
+        self.annualStateCosts = strategy.annualStateCosts
+        self.annualStateUtilities = strategy.annualStateUtilities
 
-        # initial health state
-        self.initialHealthState = Data.HealthStates.WELL
+        # one-time costs of entering health states
+        self.oneTimeStateCosts = strategy.oneTimeStateCosts
 
-        # annual treatment cost if stroke happens
-        if self.therapy == Therapies.Screen:
-            self.annualTreatmentCost = Data.FIT_COST
-        else:
-            self.annualTreatmentCost = 0
+        # discount rate
+        self.discountRate = strategy.discountRate
+        self.discountRates = list(discount_rates)
 
-            # transition probability matrix of the selected therapy
-        self.transRateMatrix = []
+        # tables shared by all patients
+        self.ifCollapseScreenVisits = if_collapse_screen_visits
+        self.transTables = None
+        self.costUtilityTables = None
+        self.build_tables()
 
-        # calculate transition probabilities between hiv states
-        if self.therapy == Therapies.Screen:
-            # calculate transition probability matrix for the mono therapy
-            self.transRateMatrix = Data.TRANS45_Screen_MATRIX
+    def build_tables(self):
+        """ builds the tables shared by all patients from the transition rate matrix, costs and utilities
+        (call again after changing these parameters, e.g. in probabilistic sensitivity analysis)
+        """
 
-        elif self.therapy == Therapies.NoScreen:
-            # calculate transition probability matrix for the combination therapy
-            self.transRateMatrix = Data.TRANS45_NoScreen_MATRIX
+        # exit rates, jump probabilities and absorbing states shared by all patients
+        self.transTables = ModelTables.TransitionTables(trans_rate_matrix=self.transRateMatrix)
 
-        # annual state costs and utilities
-        self.annualStateCosts = Data.ANNUAL_STATE_COST
-        self.annualStateUtilities = Data.ANNUAL_STATE_UTILITY
+        # costs and utilities of health states shared by all patients
+        self.costUtilityTables = ModelTables.CostUtilityTables(
+            annual_state_costs=self.annualStateCosts,
+            annual_state_utilities=self.annualStateUtilities,
+            one_time_state_costs=self.oneTimeStateCosts,
+            annual_treatment_cost=self.annualTreatmentCost,
+            screen_state_indices=self.stateTables.get_indices(self.stateTables.ifScreen),
+            discount_rate=self.discountRate,
+            discount_rates=self.discountRates)
 
-        # discount rate
-        self.discountRate = Data.DISCOUNT
+        # visits to the screening states are instantaneous
+        if self.ifCollapseScreenVisits:
+            self.transTables, self.costUtilityTables = ModelTables.collapse_fast_states(
+                trans_rate_matrix=self.transRateMatrix,
+                cost_utility_tables=self.costUtilityTables,
+                fast_state_indices=self.stateTables.get_indices(self.stateTables.ifScreen),
+                recorded_state_indices=self.stateTables.get_indices(self.stateTables.ifPolyp)
+                + self.stateTables.get_indices(self.stateTables.ifTreatment))
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import os
+import numpy as np
+
+
+# version of the simulation engines (increase when a change to the engines changes simulated outcomes
+# so that outcomes cached by an earlier version are not reused)
+ENGINE_VERSION = 3
+
+# outcomes of a simulated cohort that are stored in the cache
+OUTCOME_NAMES = ['survival_times', 'n_polyps', 'n_treatments', 'costs', 'utilities']
+# outcomes that are stored if they were recorded (life-years, outcomes at other discount rates,
+# and transition counts and residence times of patients)
+OPTIONAL_OUTCOME_NAMES = ['life_years', 'costs_by_rate', 'utilities_by_rate', 'transition_counts', 'residence_times']
+
+
+class ResultCache:
+    def __init__(self, directory='SimulationCache', max_size=500 * 2 ** 20):
+        """ on-disk cache of the outcomes of simulated cohorts: each cohort is stored in a .npz file
+        named by a hash of everything that determines its outcomes, so a cohort is simulated again only
+        if its parameters, population size, simulation length, id, engine or storage of outcomes change
+        :param directory: directory of the cache files
+        :param max_size: maximum total size of the cache files (bytes); the least recently used files
+            are deleted when the cache grows beyond this size
+        """
+
+        self.directory = directory
+        self.maxSize = max_size
+
+    @staticmethod
+    def get_key(parameters, pop_size, sim_length, cohort_id, if_vectorized, storage='list'):
+        """ :returns: the key of a simulated cohort (sha256 hash of everything that determines its outcomes)
+        :param parameters: parameters of the model
+        :param pop_size: population size of the cohort
+        :param sim_length: simulation length
+        :param cohort_id: cohort ID (the seed of the cohort's random numbers)
+        :param if_vectorized: if the cohort is simulated with the vectorized engine
+            (which uses a different stream of random numbers than the per-patient engine)
+        :param storage: how the outcomes of patients are stored ('list', 'array' or 'stream', see CohortOutcomes)
+        """
+
+        content = {
+            'engine_version': ENGINE_VERSION,
+            'health_states': list(parameters.healthStates.__members__),
+            'initial_state': parameters.initialHealthState.value,
+            'trans_rate_matrix': np.asarray(parameters.transRateMatrix, dtype=float).tolist(),
+            'annual_state_costs': np.asarray(parameters.annualStateCosts, dtype=float).tolist(),
+            'annual_state_utilities': np.asarray(parameters.annualStateUtilities, dtype=float).tolist(),
+            'one_time_state_costs': np.asarray(parameters.oneTimeStateCosts, dtype=float).tolist(),
+            'annual_treatment_cost': float(parameters.annualTreatmentCost),
+            'discount_rate': float(parameters.discountRate),
+            'discount_rates': [float(rate) for rate in parameters.discountRates],
+            'if_collapse_screen_visits': parameters.ifCollapseScreenVisits,
+            'pop_size': int(pop_size),
+            'sim_length': float(sim_length),
+            'cohort_id': int(cohort_id),
+            'if_vectorized': bool(if_vectorized),
+            'storage': storage
+        }
+        return hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()
+
+    def get_file_name(self, key):
+        return os.path.join(self.directory, key + '.npz')
+
+    def load(self, key):
+        """ :returns: dictionary of the cached outcomes of a cohort (see OUTCOME_NAMES) or None if not cached
+        :param key: key of the cohort (see get_key)
+        """
+
+        file_name = self.get_file_name(key)
+        try:
+            with np.load(file_name) as data:
+                outcomes = {name: data[name] for name in OUTCOME_NAMES}
+                outcomes.update({name: data[name] for name in OPTIONAL_OUTCOME_NAMES if name in data})
+        except (OSError, KeyError, ValueError):
+            # not cached (or an incomplete file)
+            return None
+
+        # mark the file as recently used
+        os.utime(file_name)
+        return outcomes
+
+    def save(self, key, outcomes):
+        """ stores the outcomes of a cohort and deletes the least recently used files if the cache is too large
+        :param key: key of the cohort (see get_key)
+        :param outcomes: dictionary of the outcomes of the cohort (see OUTCOME_NAMES and OPTIONAL_OUTCOME_NAMES;
+            optional outcomes that are None are not stored)
+        """
+
+        os.makedirs(self.directory, exist_ok=True)
+        file_name = self.get_file_name(key)
+
+        # write to a temporary file first so that an interrupted write does not leave a corrupted entry
+        temp_file_name = '{}.{}.tmp.npz'.format(file_name[:-len('.npz')], os.getpid())
+        np.savez(temp_file_name, **{name: np.asarray(outcomes[name]) for name in OUTCOME_NAMES
+                                    + OPTIONAL_OUTCOME_NAMES if outcomes.get(name) is not None})
+        os.replace(temp_file_name, file_name)
+
+        self.evict()
+
+    def evict(self):
+        """ deletes the least recently used files until the cache is no larger than its maximum size """
+
+        if not os.path.isdir(self.directory):
+            return
+
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.npz') and not entry.name.endswith('.tmp.npz'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.maxSize:
+                break
+            os.remove(path)
+            total_size -= size
+
+    def clear(self):
+        """ deletes all files of the cache """
+
+        if os.path.isdir(self.directory):
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith('.npz'):
+                    os.remove(entry.path)
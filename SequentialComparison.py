@@ -0,0 +1,139 @@
+import math
+from statistics import NormalDist
+import MarkovModelClasses as Cls
+from StreamingStatistics import OnlineStat
+
+
+class SequentialComparison:
+    def __init__(self, parameters, ref_parameters, sim_length, wtp, batch_size=1000,
+                 if_vectorized=False, if_compiled=True, if_paired=True):
+        """ compares a strategy with a reference strategy by simulating batches of patients until the
+        confidence interval of the incremental net monetary benefit is narrow enough
+        :param parameters: parameters of the strategy
+        :param ref_parameters: parameters of the reference strategy
+        :param sim_length: simulation length
+        :param wtp: willingness-to-pay per unit of utility (to calculate the net monetary benefit)
+        :param batch_size: number of patients simulated under each strategy in each batch
+        :param if_vectorized: set to True to simulate batches with the vectorized engine
+            (only for unpaired comparisons, since its cohorts are not paired patient by patient;
+            see VectorizedModel.simulate_cohort)
+        :param if_compiled: set to True to simulate batches with the compiled kernel if numba is installed
+            (see Cohort.simulate; the outcomes are those of the per-patient engine either way)
+        :param if_paired: set to True to simulate both strategies with common random numbers
+            (the confidence intervals are then calculated from the patient-by-patient differences)
+        """
+
+        if if_paired and if_vectorized:
+            raise ValueError('Paired comparisons need common random numbers patient by patient, '
+                             'which the vectorized engine does not provide; set if_vectorized=False.')
+
+        self.params = parameters
+        self.refParams = ref_parameters
+        self.simLength = sim_length
+        self.wtp = wtp
+        self.batchSize = batch_size
+        self.ifVectorized = if_vectorized
+        self.ifCompiled = if_compiled
+        self.ifPaired = if_paired
+
+        self.nBatches = 0  # number of simulated batches
+        self.nPatients = 0  # number of patients simulated under each strategy
+
+        # statistics of the outcomes of each strategy
+        self.stats = {}
+        self.refStats = {}
+        # statistics of the patient-by-patient differences in outcomes (if paired)
+        self.differenceStats = {}
+        for outcome in ('cost', 'utility', 'nmb'):
+            self.stats[outcome] = OnlineStat(name=outcome)
+            self.refStats[outcome] = OnlineStat(name=outcome)
+            self.differenceStats[outcome] = OnlineStat(name='Incremental ' + outcome)
+
+    def simulate_batch(self):
+        """ simulates a batch of patients under both strategies and updates the statistics """
+
+        # cohort ids of the batch (patients of different batches have different ids)
+        if self.ifPaired:
+            cohort_id = ref_cohort_id = self.nBatches
+        else:
+            cohort_id, ref_cohort_id = 2 * self.nBatches, 2 * self.nBatches + 1
+
+        outcomes = {}
+        for key, parameters, id in (('strategy', self.params, cohort_id), ('ref', self.refParams, ref_cohort_id)):
+            cohort = Cls.Cohort(id=id, pop_size=self.batchSize, parameters=parameters, outcome_storage='array')
+            cohort.simulate(sim_length=self.simLength, if_vectorized=self.ifVectorized, if_compiled=self.ifCompiled)
+            costs = cohort.cohortOutcomes.costs
+            utilities = cohort.cohortOutcomes.utilities
+            outcomes[key] = {'cost': costs, 'utility': utilities, 'nmb': self.wtp * utilities - costs}
+
+        for outcome in ('cost', 'utility', 'nmb'):
+            self.stats[outcome].record_array(outcomes['strategy'][outcome])
+            self.refStats[outcome].record_array(outcomes['ref'][outcome])
+            if self.ifPaired:
+                self.differenceStats[outcome].record_array(outcomes['strategy'][outcome] - outcomes['ref'][outcome])
+
+        self.nBatches += 1
+        self.nPatients += self.batchSize
+
+    def get_incremental_mean(self, outcome):
+        """ :returns: estimate of the mean increase in the outcome under the strategy
+        :param outcome: 'cost', 'utility' or 'nmb' (net monetary benefit)
+        """
+
+        return self.stats[outcome].get_mean() - self.refStats[outcome].get_mean()
+
+    def get_incremental_half_width(self, outcome, alpha=0.05):
+        """ :returns: half-width of the (1-alpha) confidence interval of the mean increase in the outcome
+        :param outcome: 'cost', 'utility' or 'nmb' (net monetary benefit)
+        """
+
+        if self.ifPaired:
+            return self.differenceStats[outcome].get_half_width(alpha=alpha)
+
+        if self.nPatients < 2:
+            return math.nan
+        return NormalDist().inv_cdf(1 - alpha / 2) * math.sqrt(
+            (self.stats[outcome].get_variance() + self.refStats[outcome].get_variance()) / self.nPatients)
+
+    def simulate(self, target_half_width, max_pop_size, alpha=0.05, min_n_batches=2, if_stop_on_decision=False):
+        """ simulates batches until the half-width of the confidence interval of the incremental
+        net monetary benefit is below the target or the maximum number of patients is simulated
+        :param target_half_width: target half-width of the confidence interval of the incremental NMB
+        :param max_pop_size: maximum number of patients to simulate under each strategy
+        :param alpha: significance level
+        :param min_n_batches: minimum number of batches (so that the variance is not estimated from too few patients)
+        :param if_stop_on_decision: set to True to also stop as soon as the confidence interval of the
+            incremental NMB excludes 0 (i.e. one strategy is clearly preferred at this willingness-to-pay;
+            note that checking after every batch makes the interval less conservative than its nominal level)
+        :returns: True if the target half-width was reached (or the decision is clear if if_stop_on_decision)
+        """
+
+        if max_pop_size < self.nPatients + self.batchSize:
+            raise ValueError('The maximum number of patients ({}) does not allow simulating another batch '
+                             'of {} patients.'.format(max_pop_size, self.batchSize))
+
+        while self.nPatients + self.batchSize <= max_pop_size:
+            self.simulate_batch()
+            if self.nBatches < min_n_batches:
+                continue
+
+            half_width = self.get_incremental_half_width(outcome='nmb', alpha=alpha)
+            if half_width <= target_half_width:
+                return True
+            if if_stop_on_decision and abs(self.get_incremental_mean(outcome='nmb')) > half_width:
+                return True
+
+        return False
+
+    def get_formatted_incremental_mean_and_interval(self, outcome, alpha=0.05, deci=0, form=None):
+        """ :returns: text of the mean increase in the outcome and its (1-alpha) confidence interval
+        :param outcome: 'cost', 'utility' or 'nmb' (net monetary benefit)
+        :param form: ',' to use thousands separators
+        """
+
+        number_format = '{:,.{deci}f}' if form == ',' else '{:.{deci}f}'
+        mean = self.get_incremental_mean(outcome=outcome)
+        half_width = self.get_incremental_half_width(outcome=outcome, alpha=alpha)
+        return '{} ({}, {})'.format(number_format.format(mean, deci=deci),
+                                    number_format.format(mean - half_width, deci=deci),
+                                    number_format.format(mean + half_width, deci=deci))
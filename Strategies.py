@@ -0,0 +1,86 @@
+import InputData45Screen
+import InputData50Screen
+import InputDataDNA
+import InputDataFIT
+import ParameterClasses
+
+
+class StrategySpec:
+    def __init__(self, name, data, trans_rate_matrix, annual_screening_cost, sim_length):
+        """ declarative specification of a screening strategy
+        :param name: name of the strategy
+        :param data: InputData module with the health states, costs, utilities and discount rate
+        :param trans_rate_matrix: transition rate matrix
+        :param annual_screening_cost: annual cost of screening (charged in the screening states)
+        :param sim_length: simulation length (years)
+        """
+
+        self.name = name
+        self.healthStates = data.HealthStates
+        self.transRateMatrix = trans_rate_matrix
+        self.annualStateCosts = data.ANNUAL_STATE_COST
+        self.annualStateUtilities = data.ANNUAL_STATE_UTILITY
+        self.oneTimeStateCosts = data.ONE_TIME_STATE_COST
+        self.annualScreeningCost = annual_screening_cost
+        self.discountRate = data.DISCOUNT
+        self.simLength = sim_length
+
+
+# registry of strategies
+STRATEGIES = {spec.name: spec for spec in [
+    # no screening vs. FIT screening starting at 45
+    StrategySpec(name='No Screen At 45', data=InputData45Screen,
+                 trans_rate_matrix=InputData45Screen.TRANS45_NoScreen_MATRIX,
+                 annual_screening_cost=0,
+                 sim_length=InputData45Screen.SIM_TIME_STEPS),
+    StrategySpec(name='Screen At 45', data=InputData45Screen,
+                 trans_rate_matrix=InputData45Screen.TRANS45_Screen_MATRIX,
+                 annual_screening_cost=InputData45Screen.FIT_COST,
+                 sim_length=InputData45Screen.SIM_TIME_STEPS),
+    # no screening vs. FIT screening starting at 50
+    StrategySpec(name='No Screen At 50', data=InputData50Screen,
+                 trans_rate_matrix=InputData50Screen.TRANS50_NoScreen_MATRIX,
+                 annual_screening_cost=0,
+                 sim_length=InputData50Screen.SIM_TIME_STEPS),
+    StrategySpec(name='Screen At 50', data=InputData50Screen,
+                 trans_rate_matrix=InputData50Screen.TRANS50_Screen_MATRIX,
+                 annual_screening_cost=InputData50Screen.FIT_COST,
+                 sim_length=InputData50Screen.SIM_TIME_STEPS),
+    # annual FIT screening starting at 45 vs. 50
+    StrategySpec(name='FIT Screen At 45', data=InputDataFIT,
+                 trans_rate_matrix=InputDataFIT.TRANS45_Screen_MATRIX,
+                 annual_screening_cost=InputDataFIT.FIT_COST,
+                 sim_length=InputDataFIT.SIM_TIME_STEPS),
+    StrategySpec(name='FIT Screen At 50', data=InputDataFIT,
+                 trans_rate_matrix=InputDataFIT.TRANS50_Screen_MATRIX,
+                 annual_screening_cost=InputDataFIT.FIT_COST,
+                 sim_length=InputDataFIT.SIM_TIME_STEPS),
+    # MT-sDNA screening every 3 years starting at 45 vs. 50
+    StrategySpec(name='DNA Screen At 45', data=InputDataDNA,
+                 trans_rate_matrix=InputDataDNA.TRANS45_DNAScreen_MATRIX,
+                 annual_screening_cost=InputDataDNA.DNA_COST,
+                 sim_length=InputDataDNA.SIM_TIME_STEPS),
+    StrategySpec(name='DNA Screen At 50', data=InputDataDNA,
+                 trans_rate_matrix=InputDataDNA.TRANS50_DNAScreen_MATRIX,
+                 annual_screening_cost=InputDataDNA.DNA_COST,
+                 sim_length=InputDataDNA.SIM_TIME_STEPS),
+]}
+
+
+# parameters built so far (so that strategies simulated in the same process share their tables)
+_parameters = {}
+
+
+def get_parameters(name, if_collapse_screen_visits=False, discount_rates=()):
+    """ :returns: the Parameters of a registered strategy (built once per process and then reused)
+    :param name: name of the strategy
+    :param if_collapse_screen_visits: set to True to treat visits to the screening states as instantaneous
+    :param discount_rates: other discount rates at which costs and utilities are also accumulated
+    """
+
+    key = (name, if_collapse_screen_visits, tuple(discount_rates))
+    if key not in _parameters:
+        _parameters[key] = ParameterClasses.Parameters(strategy=STRATEGIES[name],
+                                                       if_collapse_screen_visits=if_collapse_screen_visits,
+                                                       discount_rates=discount_rates)
+    return _parameters[key]
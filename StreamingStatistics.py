@@ -0,0 +1,112 @@
+import math
+from statistics import NormalDist
+import numpy as np
+
+
+class OnlineStat:
+    def __init__(self, name, bin_width=None):
+        """ summary statistics of observations that are updated as observations arrive
+        (Welford's algorithm) without storing the observations
+        :param name: name of the statistics
+        :param bin_width: width of histogram bins (no histogram if None)
+        """
+
+        self.name = name
+        self.n = 0  # number of observations
+        self.mean = 0  # mean of observations
+        self.sumSquaredDev = 0  # sum of squared deviations from the mean
+
+        self.binWidth = bin_width
+        self.binCounts = {}  # number of observations in [k * bin_width, (k+1) * bin_width) for each k
+
+    def record(self, obs):
+        """ records a new observation
+        :param obs: observation
+        """
+
+        self.n += 1
+        delta = obs - self.mean
+        self.mean += delta / self.n
+        self.sumSquaredDev += delta * (obs - self.mean)
+
+        if self.binWidth is not None:
+            k = math.floor(obs / self.binWidth)
+            self.binCounts[k] = self.binCounts.get(k, 0) + 1
+
+    def record_array(self, obs):
+        """ records an array of new observations
+        :param obs: array of observations
+        """
+
+        obs = np.asarray(obs, dtype=float)
+        if obs.size == 0:
+            return
+
+        other = OnlineStat(name=self.name, bin_width=self.binWidth)
+        other.n = obs.size
+        other.mean = obs.mean()
+        other.sumSquaredDev = ((obs - other.mean) ** 2).sum()
+        if self.binWidth is not None:
+            bins, counts = np.unique(np.floor(obs / self.binWidth).astype(np.int64), return_counts=True)
+            other.binCounts = dict(zip(bins.tolist(), counts.tolist()))
+
+        self.merge(other)
+
+    def merge(self, other):
+        """ merges the statistics of another set of observations into these statistics
+        (Chan's parallel algorithm)
+        :param other: OnlineStat of another set of observations
+        """
+
+        n = self.n + other.n
+        if n == 0:
+            return
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / n
+        self.sumSquaredDev += other.sumSquaredDev + delta ** 2 * self.n * other.n / n
+        self.n = n
+
+        for k, count in other.binCounts.items():
+            self.binCounts[k] = self.binCounts.get(k, 0) + count
+
+    def get_mean(self):
+        return self.mean
+
+    def get_variance(self):
+        return self.sumSquaredDev / (self.n - 1) if self.n > 1 else 0
+
+    def get_stdev(self):
+        return math.sqrt(self.get_variance())
+
+    def get_half_width(self, alpha):
+        """ :returns: half-width of the (1-alpha) confidence interval of the mean
+        (normal approximation, which matches the t-interval for the cohort sizes simulated here) """
+
+        if self.n < 2:
+            return math.nan
+        return NormalDist().inv_cdf(1 - alpha / 2) * self.get_stdev() / math.sqrt(self.n)
+
+    def get_interval(self, interval_type='c', alpha=0.05):
+        """ :returns: (1-alpha) confidence interval of the mean (only interval_type='c' is supported) """
+
+        if interval_type != 'c':
+            raise ValueError('Only confidence intervals (interval_type=\'c\') are available from online statistics.')
+        half_width = self.get_half_width(alpha=alpha)
+        return self.mean - half_width, self.mean + half_width
+
+    def get_formatted_mean_and_interval(self, interval_type='c', alpha=0.05, deci=0, form=None):
+        """ :returns: text of the mean and (1-alpha) confidence interval, e.g. '1,234 (1,000, 1,468)'
+        :param form: ',' to use thousands separators
+        """
+
+        number_format = '{:,.{deci}f}' if form == ',' else '{:.{deci}f}'
+        lower, upper = self.get_interval(interval_type=interval_type, alpha=alpha)
+        return '{} ({}, {})'.format(number_format.format(self.mean, deci=deci),
+                                    number_format.format(lower, deci=deci),
+                                    number_format.format(upper, deci=deci))
+
+    def get_histogram(self):
+        """ :returns: (lower edges of histogram bins, number of observations in each bin) """
+
+        bins = sorted(self.binCounts)
+        return [k * self.binWidth for k in bins], [self.binCounts[k] for k in bins]
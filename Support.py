@@ -56,16 +56,43 @@ def print_outcomes(sim_outcomes, therapy_name):
     print("")
 
 
-def plot_survival_curves_and_histograms(sim_outcomes_screen, sim_outcomes_no_screen):
-    """ draws the survival curves and the histograms of time until HIV deaths
-    :param sim_outcomes_mono: outcomes of a cohort simulated under mono therapy
-    :param sim_outcomes_combo: outcomes of a cohort simulated under combination therapy
+def print_outcomes_by_discount_rate(sim_outcomes, therapy_name):
+    """ prints the life-years and the costs and utilities of a simulated cohort at each of the
+    discount rates at which they were recorded (see CohortOutcomes.discountRates)
+    :param sim_outcomes: outcomes of a simulated cohort
+    :param therapy_name: the name of the selected therapy
     """
 
-    # get survival curves of both treatments
+    print(therapy_name)
+    print("  Estimate of life-years and {:.{prec}%} confidence interval:".format(1 - D.ALPHA, prec=0),
+          sim_outcomes.statLifeYears.get_formatted_mean_and_interval(interval_type='c', alpha=D.ALPHA, deci=2))
+    for rate in sim_outcomes.discountRates:
+        cost_mean_CI_text = sim_outcomes.get_stat_cost(discount_rate=rate)\
+            .get_formatted_mean_and_interval(interval_type='c',
+                                             alpha=D.ALPHA,
+                                             deci=0,
+                                             form=',')
+        utility_mean_CI_text = sim_outcomes.get_stat_utility(discount_rate=rate)\
+            .get_formatted_mean_and_interval(interval_type='c',
+                                             alpha=D.ALPHA,
+                                             deci=2)
+        print("  Discounted at {:.{prec}%}: cost".format(rate, prec=1), cost_mean_CI_text,
+              "utility", utility_mean_CI_text)
+    print("")
+
+
+def plot_survival_curves_and_histograms(sim_outcomes, ref_outcomes, strategy_name, ref_name):
+    """ draws the survival curves and the histograms of survival times
+    :param sim_outcomes: outcomes of a cohort simulated under a strategy
+    :param ref_outcomes: outcomes of a cohort simulated under the reference strategy
+    :param strategy_name: name of the strategy
+    :param ref_name: name of the reference strategy
+    """
+
+    # get survival curves of both strategies
     survival_curves = [
-        sim_outcomes_no_screen.nLivingPatients,
-        sim_outcomes_screen.nLivingPatients
+        ref_outcomes.nLivingPatients,
+        sim_outcomes.nLivingPatients
     ]
 
     # graph survival curve
@@ -74,14 +101,14 @@ def plot_survival_curves_and_histograms(sim_outcomes_screen, sim_outcomes_no_scr
         title='Survival curve',
         x_label='Simulation time step (year)',
         y_label='Number of alive patients',
-        legends=['Drug Therapy', 'No Drug Therapy'],
-        color_codes=['green', 'blue']
+        legends=[ref_name, strategy_name],
+        color_codes=['blue', 'green']
     )
 
     # histograms of survival times
     set_of_survival_times = [
-        sim_outcomes_no_screen.survivalTimes,
-        sim_outcomes_screen.survivalTimes
+        ref_outcomes.survivalTimes,
+        sim_outcomes.survivalTimes
     ]
 
     # graph histograms
@@ -91,24 +118,26 @@ def plot_survival_curves_and_histograms(sim_outcomes_screen, sim_outcomes_no_scr
         x_label='Survival time (year)',
         y_label='Counts',
         bin_width=1,
-        legends=['Screen at 45', 'No Screen at 45'],
-        color_codes=['green', 'blue'],
+        legends=[ref_name, strategy_name],
+        color_codes=['blue', 'green'],
         transparency=0.5
     )
 
 
-def print_comparative_outcomes(sim_outcomes_screen, sim_outcomes_no_screen):
+def print_comparative_outcomes(sim_outcomes, ref_outcomes, if_paired=False):
     """ prints average increase in survival time, discounted cost, and discounted utility
-    under combination therapy compared to mono therapy
-    :param sim_outcomes_mono: outcomes of a cohort simulated under mono therapy
-    :param sim_outcomes_combo: outcomes of a cohort simulated under combination therapy
+    under a strategy compared to the reference strategy
+    :param sim_outcomes: outcomes of a cohort simulated under a strategy
+    :param ref_outcomes: outcomes of a cohort simulated under the reference strategy
+    :param if_paired: set to True if the cohorts were simulated with common random numbers by a per-patient engine
+        (costs, utilities and counts are then compared patient by patient)
     """
 
-    # increase in mean survival time under combination therapy with respect to mono therapy
+    # increase in mean survival time under the strategy with respect to the reference strategy
     increase_survival_time = Stat.DifferenceStatIndp(
         name='Increase in mean survival time',
-        x=sim_outcomes_screen.survivalTimes,
-        y_ref=sim_outcomes_no_screen.survivalTimes)
+        x=sim_outcomes.survivalTimes,
+        y_ref=ref_outcomes.survivalTimes)
 
     # estimate and CI
     estimate_CI = increase_survival_time.get_formatted_mean_and_interval(interval_type='c',
@@ -118,11 +147,15 @@ def print_comparative_outcomes(sim_outcomes_screen, sim_outcomes_no_screen):
           .format(1 - D.ALPHA, prec=0),
           estimate_CI)
 
-    # increase in mean discounted cost under combination therapy with respect to mono therapy
-    increase_discounted_cost = Stat.DifferenceStatIndp(
+    # paired differences if the cohorts were simulated with common random numbers
+    # (survival times are only recorded for patients who die, so they are not paired)
+    difference_stat = Stat.DifferenceStatPaired if if_paired else Stat.DifferenceStatIndp
+
+    # increase in mean discounted cost under the strategy with respect to the reference strategy
+    increase_discounted_cost = difference_stat(
         name='Increase in mean discounted cost',
-        x=sim_outcomes_screen.costs,
-        y_ref=sim_outcomes_no_screen.costs)
+        x=sim_outcomes.costs,
+        y_ref=ref_outcomes.costs)
 
     # estimate and CI
     estimate_CI = increase_discounted_cost.get_formatted_mean_and_interval(interval_type='c',
@@ -133,11 +166,11 @@ def print_comparative_outcomes(sim_outcomes_screen, sim_outcomes_no_screen):
           .format(1 - D.ALPHA, prec=0),
           estimate_CI)
 
-    # increase in mean discounted utility under combination therapy with respect to mono therapy
-    increase_discounted_utility = Stat.DifferenceStatIndp(
+    # increase in mean discounted utility under the strategy with respect to the reference strategy
+    increase_discounted_utility = difference_stat(
         name='Increase in mean discounted utility',
-        x=sim_outcomes_screen.utilities,
-        y_ref=sim_outcomes_no_screen.utilities)
+        x=sim_outcomes.utilities,
+        y_ref=ref_outcomes.utilities)
 
     # estimate and CI
     estimate_CI = increase_discounted_utility.get_formatted_mean_and_interval(interval_type='c',
@@ -147,10 +180,10 @@ def print_comparative_outcomes(sim_outcomes_screen, sim_outcomes_no_screen):
           .format(1 - D.ALPHA, prec=0),
           estimate_CI)
 
-    decrease_number_polyp = Stat.DifferenceStatIndp(
+    decrease_number_polyp = difference_stat(
         name='Decrease in expected number of polyps',
-        x=sim_outcomes_screen.nTotalPolyps,
-        y_ref=sim_outcomes_no_screen.nTotalPolyps)
+        x=sim_outcomes.nTotalPolyps,
+        y_ref=ref_outcomes.nTotalPolyps)
 
     # estimate and CI
     estimate_CI = decrease_number_polyp.get_formatted_mean_and_interval(interval_type='c',
@@ -160,10 +193,10 @@ def print_comparative_outcomes(sim_outcomes_screen, sim_outcomes_no_screen):
           .format(1 - D.ALPHA, prec=0),
           estimate_CI)
 
-    increase_number_treat = Stat.DifferenceStatIndp(
+    increase_number_treat = difference_stat(
         name='Increase in expected number of treatments',
-        x=sim_outcomes_screen.NTreatments,
-        y_ref=sim_outcomes_no_screen.NTreatments)
+        x=sim_outcomes.NTreatments,
+        y_ref=ref_outcomes.NTreatments)
 
     # estimate and CI
     estimate_CI = increase_number_treat.get_formatted_mean_and_interval(interval_type='c',
@@ -173,31 +206,38 @@ def print_comparative_outcomes(sim_outcomes_screen, sim_outcomes_no_screen):
           .format(1 - D.ALPHA, prec=0),
           estimate_CI)
 
-def report_CEA_CBA(sim_outcomes_screen, sim_outcomes_no_screen):
+
+def report_CEA_CBA(sim_outcomes, ref_outcomes, strategy_name, ref_name,
+                   y_range=(-1000, 3000), wtp_range=(0, 11000), if_paired=False):
     """ performs cost-effectiveness and cost-benefit analyses
-    :param sim_outcomes_mono: outcomes of a cohort simulated under mono therapy
-    :param sim_outcomes_combo: outcomes of a cohort simulated under combination therapy
+    :param sim_outcomes: outcomes of a cohort simulated under a strategy
+    :param ref_outcomes: outcomes of a cohort simulated under the reference strategy
+    :param strategy_name: name of the strategy
+    :param ref_name: name of the reference strategy
+    :param y_range: range of additional cost in the cost-utility figure
+    :param wtp_range: range of willingness-to-pay values in the net monetary benefit figure
+    :param if_paired: set to True if the cohorts were simulated with common random numbers by a per-patient engine
     """
 
     # define two strategies
-    screen_strategy = Econ.Strategy(
-        name='Screen At 45',
-        cost_obs=sim_outcomes_screen.costs,
-        effect_obs=sim_outcomes_screen.utilities,
+    strategy = Econ.Strategy(
+        name=strategy_name,
+        cost_obs=sim_outcomes.costs,
+        effect_obs=sim_outcomes.utilities,
         color='green'
     )
-    no_screen_strategy = Econ.Strategy(
-        name='No Screen At 45',
-        cost_obs=sim_outcomes_no_screen.costs,
-        effect_obs=sim_outcomes_no_screen.utilities,
+    ref_strategy = Econ.Strategy(
+        name=ref_name,
+        cost_obs=ref_outcomes.costs,
+        effect_obs=ref_outcomes.utilities,
         color='blue'
     )
 
     # do CEA
     # (the first strategy in the list of strategies is assumed to be the 'Base' strategy)
     CEA = Econ.CEA(
-        strategies=[no_screen_strategy, screen_strategy],
-        if_paired=False
+        strategies=[ref_strategy, strategy],
+        if_paired=if_paired
     )
 
     # plot cost-utility figure
@@ -206,7 +246,7 @@ def report_CEA_CBA(sim_outcomes_screen, sim_outcomes_no_screen):
         x_label='Additional Utilities',
         y_label='Additional Cost',
         x_range=(-0.5, 0.8),
-        y_range=(-1000, 3000),
+        y_range=y_range,
         interval_type='c'  # to show confidence intervals for cost and effect of each strategy
     )
 
@@ -221,9 +261,9 @@ def report_CEA_CBA(sim_outcomes_screen, sim_outcomes_no_screen):
 
     # CBA
     NBA = Econ.CBA(
-        strategies=[no_screen_strategy, screen_strategy],
-        wtp_range=[0, 11000],
-        if_paired=False
+        strategies=[ref_strategy, strategy],
+        wtp_range=wtp_range,
+        if_paired=if_paired
     )
     # show the net monetary benefit figure
     NBA.plot_incremental_nmbs(
@@ -234,3 +274,53 @@ def report_CEA_CBA(sim_outcomes_screen, sim_outcomes_no_screen):
         show_legend=True,
         figure_size=(6, 5)
     )
+
+
+def report_CEA_frontier(strategy_outcomes, x_range=(-0.5, 0.8), y_range=(-1000, 3000),
+                        file_name='CETable.csv', if_paired=False):
+    """ performs cost-effectiveness analysis of several strategies at once
+    (strategies that are not on the cost-effectiveness frontier are reported as dominated)
+    :param strategy_outcomes: dictionary of cohort outcomes keyed by strategy name
+        (the first strategy is the 'Base' strategy)
+    :param x_range: range of additional utility in the cost-utility figure
+    :param y_range: range of additional cost in the cost-utility figure
+    :param file_name: name of the csv file to write the CE table to
+    :param if_paired: set to True if the cohorts were simulated with common random numbers by a per-patient engine
+    """
+
+    colors = ['blue', 'green', 'red', 'orange', 'purple', 'brown', 'cyan', 'magenta']
+
+    # define the strategies
+    strategies = []
+    for i, (name, outcomes) in enumerate(strategy_outcomes.items()):
+        strategies.append(Econ.Strategy(
+            name=name,
+            cost_obs=outcomes.costs,
+            effect_obs=outcomes.utilities,
+            color=colors[i % len(colors)]
+        ))
+
+    # do CEA
+    CEA = Econ.CEA(
+        strategies=strategies,
+        if_paired=if_paired
+    )
+
+    # plot cost-utility figure
+    CEA.plot_CE_plane(
+        title='Cost-Utility Analysis',
+        x_label='Additional Utilities',
+        y_label='Additional Cost',
+        x_range=x_range,
+        y_range=y_range,
+        interval_type='c'
+    )
+
+    # report the CE table
+    CEA.build_CE_table(
+        interval_type='c',
+        alpha=D.ALPHA,
+        cost_digits=0,
+        effect_digits=2,
+        icer_digits=2,
+        file_name=file_name)
@@ -0,0 +1,203 @@
+import numpy as np
+import MarkovModelClasses as Cls
+import ModelTables
+
+
+class CohortTrajectories:
+    def __init__(self, events, cohort_id, pop_size, n_states):
+        """ the trajectories (times and states of the events) of the patients of a simulated cohort,
+        to re-calculate the discounted costs and utilities of the patients for new costs, utilities or
+        discount rate without simulating the cohort again (these do not change the trajectories)
+        :param events: dictionary of the arrays of events recorded by an EventLog (see EventLog.get_events
+            and EventLog.load_events; events of patients of other cohorts are ignored)
+        :param cohort_id: ID of the simulated cohort
+        :param pop_size: population size of the cohort
+        :param n_states: number of health states
+        """
+
+        self.cohortID = cohort_id
+        self.popSize = pop_size
+        self.nStates = n_states
+
+        # events of the patients of this cohort grouped by patient (in the order of time for each patient)
+        patient_indices = events['patient_ids'] - cohort_id * pop_size
+        if_in_cohort = (patient_indices >= 0) & (patient_indices < pop_size)
+        order = np.argsort(patient_indices[if_in_cohort], kind='stable')
+        self.patientIndices = patient_indices[if_in_cohort][order]
+        self.times = events['times'][if_in_cohort][order]
+        self.fromStates = events['from_states'][if_in_cohort][order].astype(np.intp)
+        self.toStates = events['to_states'][if_in_cohort][order].astype(np.intp)
+
+        # time of the previous event of each patient (0 for the first event of a patient)
+        self.lastTimes = np.zeros(len(self.times))
+        self.lastTimes[1:] = self.times[:-1]
+        self.lastTimes[1:][self.patientIndices[1:] != self.patientIndices[:-1]] = 0
+
+        # discounted times in states and entries into states calculated so far (by discount rate)
+        self._discountedTimes = {}
+
+    def get_discounted_times(self, discount_rate):
+        """ :returns: (matrix of the discounted time each patient (row) spent in each state (column),
+                       matrix of the discount factors at the entries of each patient into each state)
+            so that the discounted cost of patients is the first matrix times the annual cost of states
+            plus the second matrix times the one-time cost of states
+            (calculated once for each discount rate)
+        :param discount_rate: annual discount rate (continuously compounded)
+        """
+
+        if discount_rate not in self._discountedTimes:
+            # discount factor at each event and the present value of a continuous payment
+            # of 1 per unit of time since the previous event (as in PatientCostUtilityMonitor)
+            discount_factors, pv_factors = ModelTables.DiscountRates(rates=[discount_rate]).get_discount_factors(
+                t_last=self.lastTimes, t=self.times)
+            discount_factors, pv_factors = discount_factors[:, 0], pv_factors[:, 0]
+
+            size = self.popSize * self.nStates
+            times_in_states = np.bincount(self.patientIndices * self.nStates + self.fromStates,
+                                          weights=pv_factors, minlength=size)
+            entries = np.bincount(self.patientIndices * self.nStates + self.toStates,
+                                  weights=discount_factors, minlength=size)
+            self._discountedTimes[discount_rate] = (times_in_states.reshape(self.popSize, self.nStates),
+                                                    entries.reshape(self.popSize, self.nStates))
+
+        return self._discountedTimes[discount_rate]
+
+    def rescore(self, cost_utility_tables, discount_rate=None):
+        """ :returns: (discounted cost of each patient, discounted utility of each patient) as NumPy arrays
+        :param cost_utility_tables: ModelTables.CostUtilityTables with the new costs, utilities and discount rate
+            (e.g. parameters.costUtilityTables after changing the parameters and calling build_tables;
+            the cohort must have been simulated with the same transition rates)
+        :param discount_rate: discount rate to use instead of the discount rate of the tables (if not None)
+        """
+
+        if discount_rate is None:
+            discount_rate = cost_utility_tables.discountRate
+        times_in_states, entries = self.get_discounted_times(discount_rate=discount_rate)
+        costs = times_in_states @ np.array(cost_utility_tables.annualCosts) \
+            + entries @ np.array(cost_utility_tables.oneTimeCosts)
+        utilities = times_in_states @ np.array(cost_utility_tables.annualUtilities)
+        return costs, utilities
+
+    def get_life_years(self):
+        """ :returns: array of the life-years of each patient (the time of the last event of the patient) """
+
+        life_years = np.zeros(self.popSize)
+        np.maximum.at(life_years, self.patientIndices, self.times)
+        return life_years
+
+    def get_survival_times(self, state_tables):
+        """ :returns: array of the survival times of the patients who died (in the order of patients)
+        :param state_tables: ModelTables.StateTables of the model
+        """
+
+        return self.times[np.array(state_tables.ifDeath)[self.toStates]]
+
+    def get_counts(self, flags):
+        """ :returns: array of the number of entries of each patient into the states that are True in flags
+        (e.g. the number of polyps for state_tables.ifPolyp)
+        :param flags: list that is True for the states to count
+        """
+
+        return np.bincount(self.patientIndices, weights=np.array(flags)[self.toStates],
+                           minlength=self.popSize).astype(np.int64)
+
+    def get_transition_counts(self):
+        """ :returns: (patients x states x states) array of the number of events of each patient
+        from each state to each state """
+
+        counts = np.bincount((self.patientIndices * self.nStates + self.fromStates) * self.nStates + self.toStates,
+                             minlength=self.popSize * self.nStates * self.nStates)
+        return counts.reshape(self.popSize, self.nStates, self.nStates).astype(np.int32)
+
+    def get_residence_times(self):
+        """ :returns: (patients x states) array of the time each patient spent in each state """
+
+        return self.get_discounted_times(discount_rate=0)[0]
+
+    def get_outcomes(self, parameters, if_record_transitions=True):
+        """ :returns: dictionary of the outcomes of the patients calculated from their events (the arguments of
+            CohortOutcomes.extract_cohort_outcomes) as NumPy arrays; the costs and utilities of each patient are
+            summed event by event, as by Patient objects, so they are identical to those of the per-patient engines
+        :param parameters: parameters of the model the cohort was simulated with (or with new costs, utilities
+            and discount rates)
+        :param if_record_transitions: set to False to leave out the transition counts and residence times
+        """
+
+        tables = parameters.costUtilityTables
+
+        # cost and utility of each event at every rate (events x rates)
+        event_costs, event_utilities = tables.get_accruals(t_last=self.lastTimes,
+                                                           t=self.times,
+                                                           from_states=self.fromStates,
+                                                           to_states=self.toStates)
+
+        # cost and utility of each patient at every rate (np.bincount adds the events in their order)
+        costs = np.zeros((self.popSize, len(tables.rates)))
+        utilities = np.zeros((self.popSize, len(tables.rates)))
+        for k in range(len(tables.rates)):
+            costs[:, k] = np.bincount(self.patientIndices, weights=event_costs[:, k], minlength=self.popSize)
+            utilities[:, k] = np.bincount(self.patientIndices, weights=event_utilities[:, k], minlength=self.popSize)
+
+        return {'survival_times': self.get_survival_times(state_tables=parameters.stateTables),
+                'n_polyps': self.get_counts(flags=parameters.stateTables.ifPolyp),
+                'n_treatments': self.get_counts(flags=parameters.stateTables.ifTreatment),
+                'costs': costs[:, 0],
+                'utilities': utilities[:, 0],
+                'life_years': self.get_life_years(),
+                'costs_by_rate': costs[:, 1:],
+                'utilities_by_rate': utilities[:, 1:],
+                'transition_counts': self.get_transition_counts() if if_record_transitions else None,
+                'residence_times': self.get_residence_times() if if_record_transitions else None}
+
+    def get_cohort_outcomes(self, parameters):
+        """ :returns: CohortOutcomes ('array' storage) of the cohort with the costs and utilities
+            re-calculated with new parameters (also at each of the other discount rates of the parameters)
+        :param parameters: parameters with the new costs, utilities and discount rate
+        """
+
+        outcomes = Cls.CohortOutcomes(storage='array', pop_size=0,
+                                      discount_rates=parameters.costUtilityTables.discountRates,
+                                      health_states=parameters.healthStates)
+        outcomes.extract_cohort_outcomes(**self.get_outcomes(parameters=parameters))
+        outcomes.calculate_cohort_outcomes(initial_pop_size=self.popSize)
+        return outcomes
+
+    def truncate(self, horizon, parameters):
+        """ :returns: CohortTrajectories of the patients as if they were simulated until an earlier horizon
+            (the events before the horizon and, for patients who are not in an absorbing state at the horizon,
+            an event into their current state at the horizon, as at the end of a simulation); the outcomes of
+            the patients of the per-patient engines are those of simulating the cohort until the horizon
+        :param horizon: horizon (not beyond the simulation length of the trajectories)
+        :param parameters: parameters of the model the cohort was simulated with
+        """
+
+        # events before the horizon
+        if_before = self.times < horizon
+        patient_indices = self.patientIndices[if_before]
+        times = self.times[if_before]
+        to_states = self.toStates[if_before]
+
+        # state of each patient at the horizon (the state after the last event before the horizon)
+        states = np.full(self.popSize, parameters.initialHealthState.value, dtype=np.intp)
+        if_last = np.ones(len(patient_indices), dtype=bool)
+        if_last[:-1] = patient_indices[1:] != patient_indices[:-1]
+        states[patient_indices[if_last]] = to_states[if_last]
+
+        # patients who stay in their state until the horizon
+        staying = np.nonzero(~parameters.transTables.ifAbsorbing[states])[0]
+
+        events = {'patient_ids': self.cohortID * self.popSize + np.concatenate((patient_indices, staying)),
+                  'times': np.concatenate((times, np.full(len(staying), float(horizon)))),
+                  'from_states': np.concatenate((self.fromStates[if_before], states[staying])),
+                  'to_states': np.concatenate((to_states, states[staying]))}
+        return CohortTrajectories(events=events, cohort_id=self.cohortID, pop_size=self.popSize,
+                                  n_states=self.nStates)
+
+    def get_horizon_outcomes(self, horizons, parameters):
+        """ :returns: dictionary of the CohortOutcomes ('array' storage) of the cohort at each horizon
+        :param horizons: list of horizons (not beyond the simulation length of the trajectories)
+        :param parameters: parameters of the model the cohort was simulated with
+        """
+
+        return {horizon: self.truncate(horizon=horizon, parameters=parameters).get_cohort_outcomes(
+            parameters=parameters) for horizon in horizons}
@@ -0,0 +1,86 @@
+import time
+import numpy as np
+import InputDataDNA as D
+import Strategies as S
+import MarkovModelClasses as Cls
+import DeterministicModel
+import SimPy.Statistics as Stat
+
+
+# validates the model with instantaneous visits to the screening states against the exact model:
+# both models are simulated for each screening strategy and the differences in outcomes
+# should be within Monte Carlo error (i.e. the confidence intervals should cover 0);
+# the bias of the expected outcomes is then calculated without Monte Carlo error by solving the
+# forward equations of both models (see DeterministicModel)
+
+# screening strategies (FIT screening is annual, so it has more screening visits than MT-sDNA screening)
+STRATEGY_NAMES = ['Screen At 45', 'Screen At 50', 'FIT Screen At 45', 'FIT Screen At 50',
+                  'DNA Screen At 45', 'DNA Screen At 50']
+
+
+def simulate_patients(parameters, pop_size, sim_length):
+    """ simulates a cohort one patient at a time and counts the events of each patient
+    :returns: (simulated cohort outcomes, number of events of each patient, simulation time)
+    """
+
+    outcomes = Cls.CohortOutcomes()
+    n_events = np.zeros(pop_size, dtype=int)
+
+    start = time.time()
+    for i in range(pop_size):
+        patient = Cls.Patient(id=i, parameters=parameters)
+
+        # count the updates of the state monitor
+        update = patient.stateMonitor.update
+
+        def counted_update(time, new_state_index, i=i, update=update):
+            n_events[i] += 1
+            update(time=time, new_state_index=new_state_index)
+
+        patient.stateMonitor.update = counted_update
+        patient.simulate(sim_length=sim_length)
+        outcomes.extract_outcome(simulated_patient=patient)
+
+    return outcomes, n_events, time.time() - start
+
+
+for name in STRATEGY_NAMES:
+
+    exact_outcomes, exact_events, exact_time = simulate_patients(
+        parameters=S.get_parameters(name=name),
+        pop_size=D.POP_SIZE, sim_length=S.STRATEGIES[name].simLength)
+    collapsed_outcomes, collapsed_events, collapsed_time = simulate_patients(
+        parameters=S.get_parameters(name=name, if_collapse_screen_visits=True),
+        pop_size=D.POP_SIZE, sim_length=S.STRATEGIES[name].simLength)
+
+    print(name)
+    print('  Mean number of events per patient (exact vs. instantaneous screening visits): {:.1f} vs. {:.1f}'
+          .format(exact_events.mean(), collapsed_events.mean()))
+    print('  Simulation time in seconds (exact vs. instantaneous screening visits): {:.2f} vs. {:.2f}'
+          .format(exact_time, collapsed_time))
+
+    for outcome, exact, collapsed in (
+            ('survival time', exact_outcomes.survivalTimes, collapsed_outcomes.survivalTimes),
+            ('number of polyps', exact_outcomes.nTotalPolyps, collapsed_outcomes.nTotalPolyps),
+            ('number of treatments', exact_outcomes.NTreatments, collapsed_outcomes.NTreatments),
+            ('discounted cost', exact_outcomes.costs, collapsed_outcomes.costs),
+            ('discounted utility', exact_outcomes.utilities, collapsed_outcomes.utilities)):
+
+        difference = Stat.DifferenceStatIndp(name='Difference in mean ' + outcome, x=collapsed, y_ref=exact)
+        print('  Difference in mean {} and {:.{prec}%} confidence interval:'.format(outcome, 1 - D.ALPHA, prec=0),
+              difference.get_formatted_mean_and_interval(interval_type='c', alpha=D.ALPHA, deci=2))
+    print('')
+
+# bias of the expected discounted cost and utility of each strategy
+print('Bias of instantaneous screening visits (expected outcome of the exact vs. the instantaneous model,')
+print('difference in % of the exact model):')
+for name in STRATEGY_NAMES:
+    exact = DeterministicModel.DeterministicCohort(parameters=S.get_parameters(name=name))
+    exact.solve(sim_length=S.STRATEGIES[name].simLength)
+    collapsed = DeterministicModel.DeterministicCohort(
+        parameters=S.get_parameters(name=name, if_collapse_screen_visits=True))
+    collapsed.solve(sim_length=S.STRATEGIES[name].simLength)
+
+    print('  {:17s} cost {:,.0f} vs. {:,.0f} ({:+.2%}), utility {:.3f} vs. {:.3f} ({:+.2%})'.format(
+        name, exact.expectedCost, collapsed.expectedCost, collapsed.expectedCost / exact.expectedCost - 1,
+        exact.expectedUtility, collapsed.expectedUtility, collapsed.expectedUtility / exact.expectedUtility - 1))
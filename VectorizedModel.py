@@ -0,0 +1,131 @@
+import numpy as np
+
+
+class VectorizedCohortTables:
+    def __init__(self, parameters):
+        """ NumPy arrays (indexed by health state) needed to simulate a whole cohort in lockstep
+        :param parameters: parameters of the model (transition rate matrix, costs, utilities, ...)
+        """
+
+        # exit rates, jump probabilities and absorbing states
+        self.exitRates = parameters.transTables.exitRates
+        self.ifAbsorbing = parameters.transTables.ifAbsorbing
+        self.cumJumpProbs = parameters.transTables.cumJumpProbs
+
+        # annual cost and utility and one-time cost of entering each state
+        self.annualCosts = np.array(parameters.costUtilityTables.annualCosts)
+        self.annualUtilities = np.array(parameters.costUtilityTables.annualUtilities)
+        self.oneTimeCosts = np.array(parameters.costUtilityTables.oneTimeCosts)
+
+        # states that count as death, polyp and treatment
+        self.ifDeath = np.array(parameters.stateTables.ifDeath)
+        self.ifPolyp = np.array(parameters.stateTables.ifPolyp)
+        self.ifTreatment = np.array(parameters.stateTables.ifTreatment)
+
+        self.initialStateIndex = parameters.initialHealthState.value
+        self.discountRate = parameters.costUtilityTables.discountRate
+
+
+def simulate_cohort(parameters, pop_size, sim_length, seed, event_log=None, transition_counts=None,
+                    if_record_transitions=False):
+    """ simulates all patients of a cohort in lockstep: the current states, clocks and
+    accumulated costs/utilities of the cohort are stored in NumPy arrays and every patient
+    who is still active is advanced by one event per iteration
+    (the cohort shares one random number stream, drawn for the active patients of each iteration, so
+    when two strategies give different event sequences the same draws go to different patients:
+    cohorts simulated with the same seed are not paired patient by patient, unlike the per-patient engines)
+    :param parameters: parameters of the model
+    :param pop_size: population size of the cohort
+    :param sim_length: simulation length
+    :param seed: seed of the random number generator of the cohort
+    :param event_log: EventLog to record the events of all patients in (events are not recorded if None;
+        patient ids are seed * pop_size + index of the patient, as in Cohort)
+    :param transition_counts: NumPy matrix to add the number of events of the patients
+        from each state (row) to each state (column) to (events are not counted if None)
+    :param if_record_transitions: set to True to record the transition counts and residence times of each patient
+    :returns: (survival times of patients who died, number of polyps, number of treatments,
+               discounted costs, discounted utilities, costs and utilities discounted at each of the
+               other discount rates (patients x rates), life-years, number of events of each patient
+               from each state to each state (patients x states x states), time each patient spent in
+               each state (patients x states)) as NumPy arrays (the last two are None if not recorded)
+    """
+
+    tables = VectorizedCohortTables(parameters=parameters)
+    cost_utility_tables = parameters.costUtilityTables
+    rng = np.random.RandomState(seed=seed)
+
+    # current state and simulation time of each patient
+    states = np.full(pop_size, tables.initialStateIndex, dtype=np.int64)
+    times = np.zeros(pop_size)
+
+    # outcomes of each patient
+    survival_times = np.full(pop_size, np.nan)
+    n_polyps = np.zeros(pop_size, dtype=np.int64)
+    n_treatments = np.zeros(pop_size, dtype=np.int64)
+    # (costs and utilities at every discount rate, see CostUtilityTables.rates)
+    costs = np.zeros((pop_size, len(cost_utility_tables.rates)))
+    utilities = np.zeros((pop_size, len(cost_utility_tables.rates)))
+    patient_transition_counts = residence_times = None
+    if if_record_transitions:
+        patient_transition_counts = np.zeros((pop_size, tables.ifAbsorbing.size, tables.ifAbsorbing.size),
+                                             dtype=np.int32)
+        residence_times = np.zeros((pop_size, tables.ifAbsorbing.size))
+
+    # patients who are still active (not in an absorbing state and not at the end of the simulation)
+    active = np.arange(pop_size)[~tables.ifAbsorbing[states]]
+
+    while active.size > 0:
+        current_states = states[active]
+        t_last = times[active]
+
+        # time until the next event and the next state of each active patient
+        dt = rng.exponential(size=active.size) / tables.exitRates[current_states]
+        u = rng.random_sample(size=active.size)
+        new_states = (tables.cumJumpProbs[current_states] <= u[:, np.newaxis]).sum(axis=1)
+
+        # patients whose next event occurs beyond the simulation length stay
+        # in the current state until the end of the simulation
+        t = t_last + dt
+        if_end = t > sim_length
+        t[if_end] = sim_length
+        new_states[if_end] = current_states[if_end]
+
+        # discounted cost and utility (continuously compounded) since the last event at every rate
+        event_costs, event_utilities = cost_utility_tables.get_accruals(t_last=t_last,
+                                                                        t=t,
+                                                                        from_states=current_states,
+                                                                        to_states=new_states)
+        costs[active] += event_costs
+        utilities[active] += event_utilities
+
+        # update counts and survival time
+        # (as in PatientStateMonitor, staying in the current state at the end of the
+        # simulation is recorded as a transition into the current state)
+        n_polyps[active] += tables.ifPolyp[new_states]
+        n_treatments[active] += tables.ifTreatment[new_states]
+        if_death = tables.ifDeath[new_states]
+        survival_times[active[if_death]] = t[if_death]
+
+        # record the events
+        if event_log is not None:
+            event_log.record_array(patient_ids=seed * pop_size + active,
+                                   times=t,
+                                   from_states=current_states,
+                                   to_states=new_states)
+        if transition_counts is not None:
+            np.add.at(transition_counts, (current_states, new_states), 1)
+        if if_record_transitions:
+            # (each active patient has one event, so the indices are unique)
+            patient_transition_counts[active, current_states, new_states] += 1
+            residence_times[active, current_states] += t - t_last
+
+        # update states and times
+        states[active] = new_states
+        times[active] = t
+
+        # remove patients who reached an absorbing state or the end of the simulation
+        active = active[~(if_end | tables.ifAbsorbing[new_states])]
+
+    # patients are alive until their last event (death or the end of the simulation)
+    return survival_times[~np.isnan(survival_times)], n_polyps, n_treatments, costs[:, 0], utilities[:, 0], \
+        costs[:, 1:], utilities[:, 1:], times, patient_transition_counts, residence_times
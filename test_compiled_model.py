@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+import Strategies as S
+import MarkovModelClasses as Cls
+import CompiledModel
+
+
+POP_SIZE = 500
+COHORT_ID = 4
+
+
+@pytest.mark.skipif(not CompiledModel.IF_COMPILED, reason='numba is not installed')
+@pytest.mark.parametrize('name', ['No Screen At 45', 'FIT Screen At 45', 'DNA Screen At 50'])
+def test_same_outcomes_as_patient_simulator(name):
+    """ the compiled kernel and PatientSimulator simulate the same patients with identical outcomes and events """
+
+    parameters = S.get_parameters(name=name, discount_rates=(0, 0.05))
+    sim_length = S.STRATEGIES[name].simLength
+
+    outcomes = []
+    transition_counts = []
+    for if_compiled in (False, True):
+        counts = np.zeros((len(parameters.healthStates), len(parameters.healthStates)), dtype=np.int64)
+        outcomes.append(Cls.simulate_patients(cohort_id=COHORT_ID, pop_size=POP_SIZE, parameters=parameters,
+                                              sim_length=sim_length, first_index=0, last_index=POP_SIZE,
+                                              storage='array', if_compiled=if_compiled, transition_counts=counts,
+                                              if_record_transitions=True))
+        transition_counts.append(counts)
+    simulator, compiled = outcomes
+    simulator.calculate_cohort_outcomes(initial_pop_size=POP_SIZE)
+    compiled.calculate_cohort_outcomes(initial_pop_size=POP_SIZE)
+
+    for attribute in ('survivalTimes', 'nTotalPolyps', 'NTreatments', 'costs', 'utilities', 'lifeYears',
+                      'costsByRate', 'utilitiesByRate', 'transitionCounts', 'residenceTimes'):
+        assert np.array_equal(getattr(compiled, attribute), getattr(simulator, attribute)), attribute
+    assert np.array_equal(transition_counts[1], transition_counts[0])
+
+    # the events of the patients are the same
+    simulator_events = Cls.PatientSimulator(parameters=parameters).simulate(
+        first_patient_id=COHORT_ID * POP_SIZE, n_patients=POP_SIZE, sim_length=sim_length)
+    compiled_events = CompiledModel.simulate_patients(parameters=parameters, sim_length=sim_length,
+                                                      first_patient_id=COHORT_ID * POP_SIZE, n_patients=POP_SIZE)
+    for simulator_column, compiled_column in zip(simulator_events, compiled_events):
+        assert np.array_equal(compiled_column, simulator_column)
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+import SimPy.EconEval as Econ
+import Strategies as S
+import MarkovModelClasses as Cls
+
+
+POP_SIZE = 200
+COHORT_ID = 1
+
+
+class EconEvalCostUtilityMonitor:
+    """ the cost and utility accounting of PatientCostUtilityMonitor before the per-state tables
+    (a call to Econ.pv_continuous_payment and Econ.pv_single_payment for every payment of every event) """
+
+    def __init__(self, parameters):
+
+        self.tLastRecorded = 0
+        self.params = parameters
+        self.totalDiscountedCost = 0
+        self.totalDiscountedUtility = 0
+        self.totalDiscountedCosts = []
+        self.totalDiscountedUtilities = []
+
+    def update(self, time, current_state_index, next_state_index):
+
+        states = self.params.healthStates
+        current_state = states(current_state_index)
+        next_state = states(next_state_index)
+
+        # cost and utility (per unit of time) during the period since the last recording until now
+        if current_state in (states.SCREEN_NO_DISEASE, states.SCREEN_DISEASE):
+            cost = self.params.annualStateCosts[current_state.value] + self.params.annualTreatmentCost
+        else:
+            cost = self.params.annualStateCosts[current_state.value]
+        utility = self.params.annualStateUtilities[current_state.value]
+
+        # discounted cost and utility (continuously compounded)
+        discounted_cost = Econ.pv_continuous_payment(payment=cost,
+                                                     discount_rate=self.params.discountRate,
+                                                     discount_period=(self.tLastRecorded, time))
+        discounted_utility = Econ.pv_continuous_payment(payment=utility,
+                                                        discount_rate=self.params.discountRate,
+                                                        discount_period=(self.tLastRecorded, time))
+        if next_state in (states.SMALL, states.LARGE):
+            discounted_cost += Econ.pv_single_payment(payment=1823, discount_rate=0.03,
+                                                      discount_period=time,
+                                                      discount_continuously=True)
+        if next_state == states.CRC:
+            discounted_cost += Econ.pv_single_payment(payment=64986, discount_rate=0.03,
+                                                      discount_period=time,
+                                                      discount_continuously=True)
+        if next_state == states.TREATMENT:
+            discounted_cost += Econ.pv_single_payment(payment=1278, discount_rate=0.03,
+                                                      discount_period=time,
+                                                      discount_continuously=True)
+
+        self.totalDiscountedCost += discounted_cost
+        self.totalDiscountedUtility += discounted_utility
+        self.tLastRecorded = time
+
+
+@pytest.mark.parametrize('name', ['Screen At 45', 'DNA Screen At 45', 'FIT Screen At 50'])
+def test_same_totals_as_econ_eval(name, monkeypatch):
+    """ the same seeded cohort accounted with Econ.pv_* calls and with CostUtilityTables """
+
+    parameters = S.get_parameters(name=name)
+    sim_length = S.STRATEGIES[name].simLength
+
+    # accounting with the per-state tables
+    cohort = Cls.Cohort(id=COHORT_ID, pop_size=POP_SIZE, parameters=parameters, outcome_storage='array')
+    cohort.simulate(sim_length=sim_length)
+    new = cohort.cohortOutcomes
+
+    # accounting with Econ.pv_* (the same patients, since each patient is seeded with its id)
+    monkeypatch.setattr(Cls, 'PatientCostUtilityMonitor', EconEvalCostUtilityMonitor)
+    old = Cls.CohortOutcomes(storage='array', pop_size=POP_SIZE)
+    for i in range(POP_SIZE):
+        patient = Cls.Patient(id=COHORT_ID * POP_SIZE + i, parameters=parameters)
+        patient.simulate(sim_length)
+        old.extract_outcome(simulated_patient=patient)
+    old.calculate_cohort_outcomes(initial_pop_size=POP_SIZE)
+
+    # the totals agree up to rounding (the discount factors are computed in a different order)
+    assert np.allclose(new.costs, old.costs, rtol=1e-9, atol=0)
+    assert np.allclose(new.utilities, old.utilities, rtol=1e-9, atol=0)
+    assert np.array_equal(new.nTotalPolyps, old.nTotalPolyps)
+    assert np.array_equal(new.NTreatments, old.NTreatments)
+    assert np.array_equal(new.survivalTimes, old.survivalTimes)
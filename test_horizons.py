@@ -0,0 +1,27 @@
+import numpy as np
+import Strategies as S
+import MarkovModelClasses as Cls
+
+
+POP_SIZE = 300
+COHORT_ID = 5
+NAME = 'FIT Screen At 45'
+HORIZONS = [10, 20.5, 30]
+
+
+def test_same_outcomes_as_separate_simulations():
+    """ the outcomes at each horizon of a cohort simulated once until the longest horizon are
+    the outcomes of simulating the cohort until that horizon """
+
+    parameters = S.get_parameters(name=NAME, discount_rates=(0, 0.05))
+    cohort = Cls.Cohort(id=COHORT_ID, pop_size=POP_SIZE, parameters=parameters)
+    horizon_outcomes = cohort.simulate_horizons(horizons=HORIZONS)
+
+    for horizon in HORIZONS:
+        separate = Cls.Cohort(id=COHORT_ID, pop_size=POP_SIZE, parameters=parameters, outcome_storage='array',
+                              if_record_transitions=True)
+        separate.simulate(sim_length=horizon)
+        for attribute in ('survivalTimes', 'nTotalPolyps', 'NTreatments', 'costs', 'utilities', 'lifeYears',
+                          'costsByRate', 'utilitiesByRate', 'transitionCounts', 'residenceTimes'):
+            assert np.array_equal(getattr(horizon_outcomes[horizon], attribute),
+                                  getattr(separate.cohortOutcomes, attribute)), (horizon, attribute)
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+import Strategies as S
+import MarkovModelClasses as Cls
+import EventLog
+import OutcomeFiles
+
+
+POP_SIZE = 100
+NAME = 'DNA Screen At 45'
+
+
+def simulate(event_log=None):
+    """ :returns: outcomes of a cohort with the optional outcomes (other discount rates and transitions) """
+
+    parameters = S.get_parameters(name=NAME, discount_rates=(0, 0.05))
+    cohort = Cls.Cohort(id=0, pop_size=POP_SIZE, parameters=parameters, outcome_storage='array',
+                        if_record_transitions=True)
+    cohort.simulate(sim_length=S.STRATEGIES[NAME].simLength, event_log=event_log)
+    return cohort.cohortOutcomes
+
+
+@pytest.mark.parametrize('if_compressed', [False, True])
+def test_save_and_load(tmp_path, if_compressed):
+
+    saved = simulate()
+    path = str(tmp_path / ('outcomes.npz' if if_compressed else 'outcomes'))
+    OutcomeFiles.save_cohort_outcomes(cohort_outcomes=saved, path=path, initial_pop_size=POP_SIZE,
+                                      if_compressed=if_compressed)
+    loaded = OutcomeFiles.load_cohort_outcomes(path=path)
+
+    # every saved column is loaded
+    for _, attribute, _ in OutcomeFiles.COLUMNS + OutcomeFiles.OPTIONAL_COLUMNS:
+        assert np.array_equal(getattr(loaded, attribute), getattr(saved, attribute)), attribute
+    assert loaded.discountRates == saved.discountRates
+    assert np.array_equal(loaded.get_outcome('nScreens'), saved.get_outcome('nScreens'))
+
+    # the summary statistics and the survival curve can be calculated from the (memory-mapped) columns
+    assert loaded.statCost.get_mean() == pytest.approx(saved.statCost.get_mean())
+    assert loaded.statUtility.get_mean() == pytest.approx(saved.statUtility.get_mean())
+    assert loaded.statNPolyps.get_mean() == pytest.approx(saved.statNPolyps.get_mean())
+    assert loaded.statLifeYears.get_mean() == pytest.approx(saved.statLifeYears.get_mean())
+    assert loaded.get_stat_cost(discount_rate=0.05).get_mean() == pytest.approx(
+        saved.get_stat_cost(discount_rate=0.05).get_mean())
+    assert loaded.nLivingPatients is not None
+
+
+def test_save_and_load_trajectories(tmp_path):
+
+    event_log = EventLog.EventLog()
+    simulate(event_log=event_log)
+    events = event_log.get_events()
+
+    for path in (str(tmp_path / 'events'), str(tmp_path / 'events.npz')):
+        OutcomeFiles.save_trajectories(events=events, path=path, if_compressed=path.endswith('.npz'))
+        loaded = OutcomeFiles.load_trajectories(path=path)
+        for name, _, _ in EventLog.COLUMNS:
+            assert np.array_equal(loaded[name], events[name]), name
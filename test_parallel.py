@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+import Strategies as S
+import MarkovModelClasses as Cls
+
+
+POP_SIZE = 300
+COHORT_ID = 2
+NAME = 'FIT Screen At 45'
+
+
+@pytest.mark.parametrize('storage', ['list', 'array'])
+def test_same_outcomes_as_serial(storage):
+    """ a cohort simulated in several processes has bit-identical outcomes to a cohort simulated in one """
+
+    parameters = S.get_parameters(name=NAME, discount_rates=(0, 0.05))
+    sim_length = S.STRATEGIES[NAME].simLength
+
+    outcomes = []
+    for n_processes in (1, 3):
+        cohort = Cls.Cohort(id=COHORT_ID, pop_size=POP_SIZE, parameters=parameters, outcome_storage=storage,
+                            if_record_transitions=True)
+        cohort.simulate(sim_length=sim_length, n_processes=n_processes)
+        outcomes.append(cohort.cohortOutcomes)
+    serial, parallel = outcomes
+
+    for attribute in ('survivalTimes', 'nTotalPolyps', 'NTreatments', 'costs', 'utilities', 'lifeYears',
+                      'costsByRate', 'utilitiesByRate', 'transitionCounts', 'residenceTimes'):
+        assert np.array_equal(getattr(parallel, attribute), getattr(serial, attribute)), attribute
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+import Strategies as S
+import MarkovModelClasses as Cls
+import ResultCache
+
+
+POP_SIZE = 200
+COHORT_ID = 3
+NAME = 'DNA Screen At 45'
+
+
+@pytest.mark.parametrize('storage', ['list', 'array'])
+def test_cache_hit_equals_fresh_simulation(tmp_path, storage):
+    """ the outcomes of a cohort loaded from the cache are those of simulating the cohort """
+
+    parameters = S.get_parameters(name=NAME, discount_rates=(0.05,))
+    sim_length = S.STRATEGIES[NAME].simLength
+    cache = ResultCache.ResultCache(directory=str(tmp_path))
+
+    outcomes = []
+    for cohort_cache in (None, cache, cache):   # a fresh simulation, a cache miss and a cache hit
+        cohort = Cls.Cohort(id=COHORT_ID, pop_size=POP_SIZE, parameters=parameters, outcome_storage=storage)
+        cohort.simulate(sim_length=sim_length, cache=cohort_cache)
+        outcomes.append(cohort.cohortOutcomes)
+    fresh, _, cached = outcomes
+
+    assert len(list(tmp_path.glob('*.npz'))) == 1
+    for attribute in ('survivalTimes', 'nTotalPolyps', 'NTreatments', 'costs', 'utilities', 'lifeYears',
+                      'costsByRate', 'utilitiesByRate'):
+        assert np.array_equal(getattr(cached, attribute), getattr(fresh, attribute)), attribute
+    assert cached.statCost.get_mean() == fresh.statCost.get_mean()
+    assert cached.statUtility.get_mean() == fresh.statUtility.get_mean()
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+import Strategies as S
+import MarkovModelClasses as Cls
+import DeterministicModel
+
+
+POP_SIZE = 5000
+COHORT_ID = 1
+N_STANDARD_ERRORS = 4   # the means of the simulated cohort are within this many standard errors
+
+
+@pytest.mark.parametrize('name', ['No Screen At 45', 'DNA Screen At 45'])
+def test_agrees_with_deterministic_model(name):
+    """ the means of a cohort simulated with the vectorized engine and the expected outcomes
+    of the forward equations agree within the Monte Carlo error """
+
+    parameters = S.get_parameters(name=name)
+    sim_length = S.STRATEGIES[name].simLength
+
+    cohort = Cls.Cohort(id=COHORT_ID, pop_size=POP_SIZE, parameters=parameters, outcome_storage='array')
+    cohort.simulate(sim_length=sim_length, if_vectorized=True)
+    outcomes = cohort.cohortOutcomes
+
+    expected = DeterministicModel.DeterministicCohort(parameters=parameters)
+    expected.solve(sim_length=sim_length)
+
+    for observations, expected_mean in ((outcomes.costs, expected.expectedCost),
+                                        (outcomes.utilities, expected.expectedUtility),
+                                        (outcomes.nTotalPolyps, expected.expectedNPolyps),
+                                        (outcomes.NTreatments, expected.expectedNTreatments)):
+        standard_error = np.std(observations, ddof=1) / np.sqrt(POP_SIZE)
+        assert abs(np.mean(observations) - expected_mean) <= N_STANDARD_ERRORS * standard_error